@@ -1,7 +1,7 @@
 """Helper components for data transformation such as embeddings and document splitting."""
 
 from copy import deepcopy
-from typing import List, TypeVar, Sequence, Union, Dict, Any
+from typing import List, TypeVar, Sequence, Union, Dict, Any, Set
 from tqdm import tqdm
 
 
@@ -24,11 +24,32 @@ __all__ = [
     "ToEmbeddings",
     "RetrieverOutputToContextStr",
     "retriever_output_to_context_str",
+    "chunk_texts_to_context_str",
 ]
 
 # TODO: make the GeneratorOutput include the token usage too.
 
 
+def chunk_texts_to_context_str(
+    ids: Sequence[Any], texts: Sequence[str], deduplicate: bool = False
+) -> str:
+    r"""Join the texts of the chunks into the context string.
+
+    ``ids`` and ``texts`` are parallel. With ``deduplicate``, only the first chunk of each id is kept.
+    """
+    sep = " "
+    if not deduplicate:
+        return sep.join(texts)
+    # compared by id instead of by text
+    seen_chunk_ids: Set[Any] = set()
+    unique_texts: List[str] = []
+    for chunk_id, text in zip(ids, texts):
+        if chunk_id not in seen_chunk_ids:
+            seen_chunk_ids.add(chunk_id)
+            unique_texts.append(text)
+    return sep.join(unique_texts)
+
+
 def retriever_output_to_context_str(
     retriever_output: Union[RetrieverOutput, List[RetrieverOutput]],
     deduplicate: bool = False,
@@ -41,26 +62,16 @@ def retriever_output_to_context_str(
     If you used query expansion, you might want to deduplicate the chunks.
     """
     chunks_to_use: List[Document] = []
-    context_str = ""
-    sep = " "
     if isinstance(retriever_output, RetrieverOutput):
         chunks_to_use = retriever_output.documents
     else:
         for output in retriever_output:
             chunks_to_use.extend(output.documents)
-    if deduplicate:
-        unique_chunks_ids = set([chunk.id for chunk in chunks_to_use])
-        # id and if it is used, it will be True
-        used_chunk_in_context_str: Dict[Any, bool] = {
-            id: False for id in unique_chunks_ids
-        }
-        for chunk in chunks_to_use:
-            if not used_chunk_in_context_str[chunk.id]:
-                context_str += sep + chunk.text
-                used_chunk_in_context_str[chunk.id] = True
-    else:
-        context_str = sep.join([chunk.text for chunk in chunks_to_use])
-    return context_str
+    return chunk_texts_to_context_str(
+        [chunk.id for chunk in chunks_to_use],
+        [chunk.text for chunk in chunks_to_use],
+        deduplicate=deduplicate,
+    )
 
 
 """
@@ -75,25 +86,40 @@ class ToEmbeddings(Component):
     r"""It transforms a Sequence of Chunks or Documents to a List of Embeddings.
 
     It operates on a copy of the input data, and does not modify the input data.
+    Set ``max_concurrency`` to send multiple batches to the embedding API at the same time.
+    Chunks with exactly the same text are embedded once.
     """
 
-    def __init__(self, embedder: Embedder, batch_size: int = 50) -> None:
-        super().__init__(batch_size=batch_size)
+    def __init__(
+        self, embedder: Embedder, batch_size: int = 50, max_concurrency: int = 1
+    ) -> None:
+        super().__init__(batch_size=batch_size, max_concurrency=max_concurrency)
         self.embedder = embedder
         self.batch_size = batch_size
-        self.batch_embedder = BatchEmbedder(embedder=embedder, batch_size=batch_size)
+        self.batch_embedder = BatchEmbedder(
+            embedder=embedder, batch_size=batch_size, max_concurrency=max_concurrency
+        )
 
     def __call__(self, input: ToEmbeddingsInputType) -> ToEmbeddingsOutputType:
         output = deepcopy(input)
-        # convert documents to a list of strings
-        embedder_input: BatchEmbedderInputType = [chunk.text for chunk in output]
+        # embed each distinct text once, the chunks with the same text share the embedding
+        text_to_position: Dict[str, int] = {}
+        positions: List[int] = [
+            text_to_position.setdefault(chunk.text, len(text_to_position))
+            for chunk in output
+        ]
+        embedder_input: BatchEmbedderInputType = list(text_to_position)
         outputs: BatchEmbedderOutputType = self.batch_embedder(input=embedder_input)
-        # n them back to the original order along with its query
+        embeddings: List[Any] = [None] * len(embedder_input)
         for batch_idx, batch_output in tqdm(
             enumerate(outputs), desc="Adding embeddings to documents from batch"
         ):
             for idx, embedding in enumerate(batch_output.data):
-                output[batch_idx * self.batch_size + idx].vector = embedding.embedding
+                embeddings[batch_idx * self.batch_size + idx] = embedding.embedding
+        # n them back to the original order along with its query
+        for chunk, position in zip(output, positions):
+            if embeddings[position] is not None:
+                chunk.vector = embeddings[position]
         return output
 
     def _extra_repr(self) -> str:
@@ -15,13 +15,14 @@ However, the following approaches are commonly shared:
 """
 
 from copy import deepcopy
-from typing import List, Literal
+from typing import List, Literal, Optional
 from tqdm import tqdm
 import logging
 
 from lightrag.core.component import Component
 from lightrag.core.types import Document
-from lightrag.core.tokenizer import Tokenizer
+from lightrag.core.tokenizer import get_tokenizer
+from lightrag.core.model_client import ResponseCache
 
 # TODO:
 # More splitters such as PDF/JSON/HTML Splitter can be built on TextSplitter.
@@ -43,8 +44,6 @@ SEPARATORS = {
 DEFAULT_CHUNK_SIZE = 800
 DEFAULT_CHUNK_OVERLAP = 200
 
-tokenizer = Tokenizer()
-
 
 class TextSplitter(Component):
     """
@@ -162,6 +161,7 @@ class TextSplitter(Component):
         chunk_size: int = DEFAULT_CHUNK_SIZE,
         chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
         batch_size: int = 1000,
+        cache_size: int = 1024,
     ):
         """
         Initializes the TextSplitter with the specified parameters for text splitting.
@@ -174,6 +174,8 @@ class TextSplitter(Component):
             chunk_overlap (int): The number of characters of overlap between chunks. Must be non-negative
                                 and less than chunk_size.
             batch_size (int): The size of documents to process in each batch.
+            cache_size (int): The max number of texts whose chunks are kept in a LRU cache, so splitting the same
+                              documents again, e.g. rebuilding the index, reuses the chunks. 0 disables the cache.
         Raises:
             ValueError: If the provided split_by is not supported, chunk_size is not greater than 0,
                         or chunk_overlap is not valid as per the given conditions.
@@ -196,6 +198,9 @@ class TextSplitter(Component):
         self.chunk_overlap = chunk_overlap
 
         self.batch_size = batch_size
+        self._split_cache: Optional[ResponseCache] = (
+            ResponseCache(max_size=cache_size) if cache_size > 0 else None
+        )
 
         log.info(
             f"Initialized TextSplitter with split_by={self.split_by}, chunk_size={self.chunk_size}, chunk_overlap={self.chunk_overlap}, batch_size={self.batch_size}"
@@ -213,6 +218,16 @@ class TextSplitter(Component):
         Returns:
             List[str]: A list of text chunks.
         """
+        if self._split_cache is None:
+            return self._split_text(text)
+        key = (self.split_by, self.chunk_size, self.chunk_overlap, text)
+        chunks = self._split_cache.get(key)
+        if chunks is None:
+            chunks = tuple(self._split_text(text))
+            self._split_cache.set(key, chunks)
+        return list(chunks)
+
+    def _split_text(self, text: str) -> List[str]:
         log.info(
             f"Splitting text with split_by: {self.split_by}, chunk_size: {self.chunk_size}, chunk_overlap: {self.chunk_overlap}"
         )
@@ -293,7 +308,7 @@ class TextSplitter(Component):
     def _split_text_into_units(self, text: str, separator: str) -> List[str]:
         """Split text based on the specified separator."""
         if self.split_by == "token":
-            splits = tokenizer.encode(text)
+            splits = get_tokenizer().encode(text)
         else:
             splits = text.split(separator)
         log.info(f"Text split by '{separator}' into {len(splits)} parts.")
@@ -336,6 +351,7 @@ class TextSplitter(Component):
 
         if self.split_by == "token":
             # decode each chunk here
+            tokenizer = get_tokenizer()
             chunks = [tokenizer.decode(chunk) for chunk in chunks]
 
         log.info(f"Merged into {len(chunks)} chunks.")
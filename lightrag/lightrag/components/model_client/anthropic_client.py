@@ -1,12 +1,12 @@
 """Anthropic ModelClient integration."""
 
 import os
-from typing import Dict, Optional, Any, Callable
+from typing import Dict, Optional, Any, Callable, Tuple
 import backoff
 import logging
 
 
-from lightrag.core.model_client import ModelClient
+from lightrag.core.model_client import ModelClient, get_cached_sync_client
 from lightrag.core.types import ModelType
 
 # optional import
@@ -34,7 +34,22 @@ def get_first_message_content(completion: Message) -> str:
     return completion.content[0].text
 
 
-__all__ = ["AnthropicAPIClient", "get_first_message_content"]
+def split_system_prompt(input: str) -> Tuple[Optional[str], str]:
+    r"""Split the rendered prompt into the system and the user prompt by the ``<SYS></SYS>`` tags.
+
+    Returns (None, input) when there is no system section or the user prompt would be empty.
+    """
+    if not isinstance(input, str) or "</SYS>" not in input:
+        return None, input
+    system_prompt, user_prompt = input.split("</SYS>", 1)
+    system_prompt = system_prompt.replace("<SYS>", "", 1).strip()
+    user_prompt = user_prompt.strip()
+    if not system_prompt or not user_prompt:
+        return None, input
+    return system_prompt, user_prompt
+
+
+__all__ = ["AnthropicAPIClient", "get_first_message_content", "split_system_prompt"]
 
 
 # NOTE: using customize parser might make the new_component more complex when we have to handle a callable
@@ -42,16 +57,22 @@ class AnthropicAPIClient(ModelClient):
     __doc__ = r"""A component wrapper for the Anthropic API client.
 
     Visit https://docs.anthropic.com/en/docs/intro-to-claude for more api details.
+
+    When the prompt has a ``<SYS></SYS>`` section, such as :ref:`DEFAULT_LIGHTRAG_SYSTEM_PROMPT<core-default_prompt_template>`,
+    it is sent as the ``system`` block with ``cache_control: ephemeral`` so that the stable prefix is eligible for
+    `prompt caching <https://docs.anthropic.com/en/docs/build-with-claude/prompt-caching>`_. The rest is sent as the user message.
     """
 
     def __init__(
         self,
         api_key: Optional[str] = None,
         chat_completion_parser: Callable[[Message], Any] = None,
+        base_url: Optional[str] = None,
     ):
         r"""It is recommended to set the ANTHROPIC_API_KEY environment variable instead of passing it as an argument."""
         super().__init__()
         self._api_key = api_key
+        self._base_url = base_url
         self.sync_client = self.init_sync_client()
         self.async_client = None  # only initialize if the async call is called
         self.tested_llm_models = ["claude-3-opus-20240229"]
@@ -63,19 +84,29 @@ class AnthropicAPIClient(ModelClient):
         api_key = self._api_key or os.getenv("ANTHROPIC_API_KEY")
         if not api_key:
             raise ValueError("Environment variable ANTHROPIC_API_KEY must be set")
-        return anthropic.Anthropic(api_key=api_key)
+        return get_cached_sync_client(
+            type(self).__name__,
+            anthropic.Anthropic,
+            api_key=api_key,
+            base_url=self._base_url or os.getenv("ANTHROPIC_BASE_URL"),
+        )
 
     def init_async_client(self):
         api_key = self._api_key or os.getenv("ANTHROPIC_API_KEY")
         if not api_key:
             raise ValueError("Environment variable ANTHROPIC_API_KEY must be set")
-        return anthropic.AsyncAnthropic(api_key=api_key)
+        return anthropic.AsyncAnthropic(api_key=api_key, base_url=self._base_url)
 
     def parse_chat_completion(self, completion: Message) -> str:
         log.debug(f"completion: {completion}")
+        usage = getattr(completion, "usage", None)
+        if usage is not None:
+            log.debug(
+                f"cache_read_input_tokens: {getattr(usage, 'cache_read_input_tokens', None)}, "
+                f"cache_creation_input_tokens: {getattr(usage, 'cache_creation_input_tokens', None)}"
+            )
         return completion.content[0].text
 
-    # TODO: potentially use <SYS></SYS> to separate the system and user messages. This requires user to follow it. If it is not found, then we will only use user message.
     def convert_inputs_to_api_kwargs(
         self,
         input: Optional[Any] = None,
@@ -84,17 +115,28 @@ class AnthropicAPIClient(ModelClient):
     ) -> dict:
         r"""Anthropic API messages separates the system and the user messages.
 
-        As we focus on one prompt, we have to use the user message as the input.
+        The ``<SYS></SYS>`` section of the prompt goes to the system block marked with ``cache_control``,
+        and the rest goes to the user message. Without the section, we use the whole prompt as the user message.
+        A ``system`` passed in model_kwargs is kept as it is.
 
         api: https://docs.anthropic.com/en/api/messages
         """
         api_kwargs = model_kwargs.copy()
         if model_type == ModelType.LLM:
+            system_prompt, user_prompt = None, input
+            if "system" not in api_kwargs:
+                system_prompt, user_prompt = split_system_prompt(input)
+            if system_prompt:
+                api_kwargs["system"] = [
+                    {
+                        "type": "text",
+                        "text": system_prompt,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ]
             api_kwargs["messages"] = [
-                {"role": "user", "content": input},
+                {"role": "user", "content": user_prompt},
             ]
-            # if input and input != "":
-            #     api_kwargs["system"] = input
         else:
             raise ValueError(f"Model type {model_type} not supported")
         return api_kwargs
@@ -3,8 +3,9 @@
 import os
 from typing import Dict, Sequence, Optional, Any
 import backoff
-from lightrag.core.model_client import ModelClient
+from lightrag.core.model_client import ModelClient, get_cached_sync_client
 from lightrag.core.types import ModelType
+from lightrag.components.model_client.utils import get_shared_http_client
 
 
 from lightrag.utils.lazy_import import safe_import, OptionalPackages
@@ -34,14 +35,16 @@ class GroqAPIClient(ModelClient):
     - gemma-7b-it
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         r"""It is recommended to set the GROQ_API_KEY environment variable instead of passing it as an argument.
 
         Args:
             api_key (Optional[str], optional): Groq API key. Defaults to None.
+            base_url (Optional[str], optional): The API base url. Defaults to None, which reads GROQ_BASE_URL or uses the Groq API.
         """
         super().__init__()
         self._api_key = api_key
+        self._base_url = base_url
         self.init_sync_client()
 
         self.async_client = None  # only initialize if the async call is called
@@ -50,13 +53,18 @@ class GroqAPIClient(ModelClient):
         api_key = self._api_key or os.getenv("GROQ_API_KEY")
         if not api_key:
             raise ValueError("Environment variable GROQ_API_KEY must be set")
-        self.sync_client = Groq(api_key=api_key)
+        self.sync_client = get_cached_sync_client(
+            type(self).__name__,
+            lambda **kwargs: Groq(**kwargs, http_client=get_shared_http_client()),
+            api_key=api_key,
+            base_url=self._base_url or os.getenv("GROQ_BASE_URL"),
+        )
 
     def init_async_client(self):
         api_key = self._api_key or os.getenv("GROQ_API_KEY")
         if not api_key:
             raise ValueError("Environment variable GROQ_API_KEY must be set")
-        self.async_client = AsyncGroq(api_key=api_key)
+        self.async_client = AsyncGroq(api_key=api_key, base_url=self._base_url)
 
     def parse_chat_completion(self, completion: Any) -> str:
         """
@@ -17,9 +17,12 @@ import logging
 import backoff
 
 
-from lightrag.core.model_client import ModelClient
+from lightrag.core.model_client import ModelClient, get_cached_sync_client
 from lightrag.core.types import ModelType, EmbedderOutput, TokenLogProb
-from lightrag.components.model_client.utils import parse_embedding_response
+from lightrag.components.model_client.utils import (
+    parse_embedding_response,
+    get_shared_http_client,
+)
 
 # optional import
 from lightrag.utils.lazy_import import safe_import, OptionalPackages
@@ -101,6 +104,7 @@ class OpenAIClient(ModelClient):
         api_key (Optional[str], optional): OpenAI API key. Defaults to None.
         chat_completion_parser (Callable[[Completion], Any], optional): A function to parse the chat completion to a str. Defaults to None.
             Default is `get_first_message_content`.
+        base_url (Optional[str], optional): The API base url, such as an OpenAI compatible server. Defaults to None, which reads OPENAI_BASE_URL or uses the OpenAI API.
 
     References:
         - Embeddings models: https://platform.openai.com/docs/guides/embeddings
@@ -112,6 +116,7 @@ class OpenAIClient(ModelClient):
         self,
         api_key: Optional[str] = None,
         chat_completion_parser: Callable[[Completion], Any] = None,
+        base_url: Optional[str] = None,
     ):
         r"""It is recommended to set the OPENAI_API_KEY environment variable instead of passing it as an argument.
 
@@ -120,6 +125,7 @@ class OpenAIClient(ModelClient):
         """
         super().__init__()
         self._api_key = api_key
+        self._base_url = base_url
         self.sync_client = self.init_sync_client()
         self.async_client = None  # only initialize if the async call is called
         self.chat_completion_parser = (
@@ -130,13 +136,18 @@ class OpenAIClient(ModelClient):
         api_key = self._api_key or os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("Environment variable OPENAI_API_KEY must be set")
-        return OpenAI(api_key=api_key)
+        return get_cached_sync_client(
+            type(self).__name__,
+            lambda **kwargs: OpenAI(**kwargs, http_client=get_shared_http_client()),
+            api_key=api_key,
+            base_url=self._base_url or os.getenv("OPENAI_BASE_URL"),
+        )
 
     def init_async_client(self):
         api_key = self._api_key or os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("Environment variable OPENAI_API_KEY must be set")
-        return AsyncOpenAI(api_key=api_key)
+        return AsyncOpenAI(api_key=api_key, base_url=self._base_url)
 
     def parse_chat_completion(
         self,
@@ -144,6 +155,15 @@ class OpenAIClient(ModelClient):
     ) -> Any:
         """Parse the completion to a str."""
         log.debug(f"completion: {completion}, parser: {self.chat_completion_parser}")
+        usage = getattr(completion, "usage", None)
+        if usage is not None:
+            # OpenAI caches the prompt prefix automatically, keep the static content at the beginning of the prompt
+            prompt_tokens_details = getattr(usage, "prompt_tokens_details", None)
+            log.info(
+                f"cached_tokens: {getattr(prompt_tokens_details, 'cached_tokens', None)}"
+            )
+        if isinstance(completion, Stream):
+            return handle_streaming_response(completion)
         return self.chat_completion_parser(completion)
 
     def parse_embedding_response(
@@ -206,10 +226,8 @@ class OpenAIClient(ModelClient):
         if model_type == ModelType.EMBEDDER:
             return self.sync_client.embeddings.create(**api_kwargs)
         elif model_type == ModelType.LLM:
-            if "stream" in api_kwargs and api_kwargs.get("stream", False):
+            if api_kwargs.get("stream", False):
                 log.debug("streaming call")
-                self.chat_completion_parser = handle_streaming_response
-                return self.sync_client.chat.completions.create(**api_kwargs)
             return self.sync_client.chat.completions.create(**api_kwargs)
         else:
             raise ValueError(f"model_type {model_type} is not supported")
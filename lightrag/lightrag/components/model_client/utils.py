@@ -1,7 +1,35 @@
 "Helpers for model client for integrating models and parsing the output."
+from functools import lru_cache
+import importlib.util
+
 from lightrag.core.types import EmbedderOutput, Embedding, Usage
 
 
+@lru_cache(maxsize=None)
+def get_shared_http_client():
+    r"""Get the process-wide ``httpx.Client`` shared by the sync SDK clients.
+
+    Passing it as ``http_client`` to the httpx-based SDKs (OpenAI, Groq) keeps the
+    TCP/TLS connections alive across model client instances instead of one pool per instance.
+    HTTP/2 is enabled when the ``h2`` package is installed.
+
+    The timeout matches the SDKs' default as they would otherwise use the client's timeout.
+
+    Note:
+        Async SDK clients are not shared as an ``httpx.AsyncClient`` is bound to the event loop it is first used in.
+    """
+    import httpx  # installed along with the SDKs
+
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=200, max_keepalive_connections=100, keepalive_expiry=30.0
+        ),
+        timeout=httpx.Timeout(600.0, connect=5.0),
+        follow_redirects=True,
+        http2=importlib.util.find_spec("h2") is not None,
+    )
+
+
 def parse_embedding_response(
     api_response,
 ) -> EmbedderOutput:
@@ -1,12 +1,11 @@
 """BM25 retriever implementation. """
 
-from typing import List, Dict, Optional, Callable, Any, Sequence
+from typing import List, Dict, Optional, Callable, Any, Sequence, Tuple
 import numpy as np
-import heapq
 import math
 import logging
 
-from lightrag.core.tokenizer import Tokenizer
+from lightrag.core.tokenizer import get_tokenizer
 from lightrag.core.types import (
     RetrieverOutput,
     RetrieverOutputType,
@@ -33,7 +32,7 @@ def split_text_by_word_fn(x: str) -> List[str]:
 
 
 def split_text_by_word_fn_then_lower_tokenized(x: str) -> List[str]:
-    tokenizer = Tokenizer()
+    tokenizer = get_tokenizer()
     words = x.lower().split(" ")
     tokens = [tokenizer.encode(word) for word in words]
     final_tokens: List[str] = []
@@ -44,7 +43,7 @@ def split_text_by_word_fn_then_lower_tokenized(x: str) -> List[str]:
 
 
 def split_text_tokenized(x: str) -> List[str]:
-    tokenizer = Tokenizer()
+    tokenizer = get_tokenizer()
     # words = x.lower().split(" ")
     tokens = tokenizer.encode(x)
     # print(tokens)
@@ -196,6 +195,9 @@ class BM25Retriever(Retriever[str, RetrieverStrQueryType]):
             False  # this is important to check if the retrieve is possible
         )
         self.total_documents: int = 0
+        # <token, (doc indices, freqs)>, inverted from t2d when the index is built,
+        # or on the first query of an instance restored by from_dict
+        self._postings: Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]] = None
 
     def _apply_split_function(self, documents: List[str]):
         if self._split_function is None:
@@ -250,22 +252,45 @@ class BM25Retriever(Retriever[str, RetrieverStrQueryType]):
         for token in negative_idf:
             self.idf[token] = eps
 
+    def _get_postings(self) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        r"""Invert t2d to <token, (doc indices, freqs)>, so a query token only touches the documents containing it."""
+        # not set on an instance restored by from_dict
+        if getattr(self, "_postings", None) is None:
+            doc_indices: Dict[str, List[int]] = {}
+            freqs: Dict[str, List[int]] = {}
+            for doc_index, term_freq in enumerate(self.t2d):
+                for token, freq in term_freq.items():
+                    doc_indices.setdefault(token, []).append(doc_index)
+                    freqs.setdefault(token, []).append(freq)
+            self._postings = {
+                token: (np.array(indices), np.array(freqs[token], dtype=np.float64))
+                for token, indices in doc_indices.items()
+            }
+        return self._postings
+
+    def _get_score_matrix(self, queries: List[List[str]]) -> np.ndarray:
+        r"""Calculate the BM25 scores of the tokenized queries, in shape (num_queries, total_documents)"""
+        postings = self._get_postings()
+        doc_len = np.array(self.doc_len, dtype=np.float64)
+        len_norm = self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
+        scores = np.zeros((len(queries), self.total_documents))
+        for score, query in zip(scores, queries):
+            for q in query:
+                if q not in postings:  # f(q_i, d) is 0 in all the documents
+                    continue
+                doc_indices, q_freq = postings[q]
+                score[doc_indices] += (self.idf.get(q) or 0) * (
+                    q_freq * (self.k1 + 1) / (q_freq + len_norm[doc_indices])
+                )
+        return scores
+
     def _get_scores(self, query: List[str]) -> List[float]:
         r"""Calculate the BM25 score for the query and the documents in the corpus
 
         Args:
             query: List[str]: The tokenized query
         """
-        score = np.zeros(self.total_documents)
-        doc_len = np.array(self.doc_len)
-        for q in query:
-            q_freq = np.array([(doc.get(q) or 0) for doc in self.t2d])
-            score += (self.idf.get(q) or 0) * (
-                q_freq
-                * (self.k1 + 1)
-                / (q_freq + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl))
-            )
-        return score.tolist()
+        return self._get_score_matrix([query])[0].tolist()
 
     def _get_batch_scores(self, query: List[str], doc_ids: List[int]) -> List[float]:
         r"""Calculate the BM25 score for the query and the documents in the corpus
@@ -309,6 +334,7 @@ class BM25Retriever(Retriever[str, RetrieverStrQueryType]):
         self.tokenized_documents = self._apply_split_function(list_of_documents_str)
         self._initialize(self.tokenized_documents)
         self._calc_idf()
+        self._get_postings()
         self.indexed = True
 
     def call(
@@ -332,15 +358,18 @@ class BM25Retriever(Retriever[str, RetrieverStrQueryType]):
             pass
         else:
             raise ValueError("input should be a string or a list of strings")
-        # process each query
-        for query in input:
-            tokens = self._split_function(query)
-            scores = self._get_scores(tokens)
-            top_k_idx = heapq.nlargest(top_k, range(len(scores)), scores.__getitem__)
-            top_k_scores = [scores[i] for i in top_k_idx]
+        # score all the queries at once, then take the top k of each row
+        queries = [self._split_function(query) for query in input]
+        scores = self._get_score_matrix(queries)
+        # stable, the documents with the same score keep their order
+        top_k_indices = np.argsort(-scores, axis=1, kind="stable")[:, :top_k]
+        top_k_scores = np.take_along_axis(scores, top_k_indices, axis=1)
+        for query, doc_indices, doc_scores in zip(input, top_k_indices, top_k_scores):
             output.append(
                 RetrieverOutput(
-                    doc_indices=top_k_idx, doc_scores=top_k_scores, query=query
+                    doc_indices=doc_indices.tolist(),
+                    doc_scores=doc_scores.tolist(),
+                    query=query,
                 )
             )
         return output
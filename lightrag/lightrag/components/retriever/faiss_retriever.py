@@ -27,6 +27,7 @@ from lightrag.core.types import (
     EmbedderOutputType,
 )
 from lightrag.core.functional import normalize_np_array, is_normalized
+from lightrag.core.model_client import ResponseCache
 
 from lightrag.utils.lazy_import import safe_import, OptionalPackages
 
@@ -47,6 +48,9 @@ FAISSRetrieverQueriesEmbeddingType = Sequence[FAISSRetrieverEmbeddingQueryType]
 
 os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
 
+# the scalar quantizer index factory string of each vector dtype in the flat index
+_VECTOR_DTYPE_TO_SQ_FACTORY = {"fp16": "SQfp16", "int8": "SQ8"}
+
 
 class FAISSRetriever(
     Retriever[FAISSRetrieverDocumentEmbeddingType, FAISSRetrieverQueryType]
@@ -63,6 +67,15 @@ class FAISSRetriever(
         dimensions (Optional[int], optional): Dimension of the embeddings. Defaults to None. It can automatically infer the dimensions from the first chunk.
         documents (Optional[FAISSRetrieverDocumentType], optional): List of embeddings. Format can be List[List[float]] or List[np.ndarray]. Defaults to None.
         metric (Literal["cosine", "euclidean", "prob"], optional): The metric to use for the retrieval. Defaults to "prob" which converts cosine similarity to probability.
+        index_factory (Optional[str], optional): The faiss index factory string, such as "IVF4096,PQ32x8". Defaults to None, which uses a flat index.
+        nprobe (Optional[int], optional): Number of inverted lists to visit per query for IVF indexes. Defaults to None, which keeps the faiss default.
+        ef_search (Optional[int], optional): The HNSW efSearch of a "HNSW32,Flat" index or of the coarse quantizer, e.g. for "IVF4096_HNSW32,PQ32". Defaults to None, which keeps the faiss default.
+        ef_construction (Optional[int], optional): The HNSW efConstruction of a "HNSW32,Flat" index, set before adding the chunks. Defaults to None, which keeps the faiss default.
+        min_train_size (int, optional): The minimum number of chunks to build an index that needs training from ``index_factory``, a flat index is used below it. Defaults to 10000.
+        vector_dtype (Literal["fp32", "fp16", "int8"], optional): How the flat index stores the vectors. "fp16" and "int8" use a scalar quantizer and take 2x and 4x less memory. Defaults to "fp32".
+        query_cache_size (int, optional): The max number of query embeddings kept in a LRU cache, so repeated string queries are not embedded again. Defaults to 0, which disables the cache.
+        use_gpu (bool, optional): Copy the index to the first GPU after it is built or loaded, which speeds up the search of batched queries. It falls back to the CPU index when faiss-gpu or a GPU is not available. Defaults to False.
+        mmap (bool, optional): Memory-map the index file in :meth:`load_index` instead of reading it into RAM, the OS only pages in the inverted lists the queries visit. The loaded index is read-only, and the embeddings the index was built from are released. Ignored with ``use_gpu``. Defaults to False.
 
     How FAISS works:
 
@@ -78,6 +91,14 @@ class FAISSRetriever(
     - faiss.IndexFlatL2: L2 or Euclidean distance, [-inf, inf]
     - faiss.IndexFlatIP: Inner product of embeddings (inner product of normalized vectors will be cosine similarity, [-1, 1])
 
+    For large corpora, use ``index_factory`` to build a compressed index, e.g. "IVF4096,PQ32x8"
+    prunes the search with 4096 inverted lists and stores each vector in 32 bytes.
+    Prepend an OPQ rotation, "OPQ32_128,IVF4096,PQ32", to recover the recall lost to the compression on correlated dimensions.
+    Increase ``nprobe`` and ``ef_search`` for a better recall at the cost of the query speed.
+    The index is trained on the chunks, so it needs at least ``min_train_size`` chunks, otherwise it falls back to the flat index.
+    When memory is not the constraint but the query latency is, "HNSW32,Flat" searches a graph of the full vectors
+    in sub-linear time without training.
+
     We choose cosine similarity and convert it to range [0, 1] by adding 1 and dividing by 2 to simulate probability in [0, 1]
 
     Install FAISS:
@@ -103,6 +124,15 @@ class FAISSRetriever(
             Callable[[Any], FAISSRetrieverDocumentEmbeddingType]
         ] = None,
         metric: Literal["cosine", "euclidean", "prob"] = "prob",
+        index_factory: Optional[str] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        ef_construction: Optional[int] = None,
+        min_train_size: int = 10000,
+        vector_dtype: Literal["fp32", "fp16", "int8"] = "fp32",
+        use_gpu: bool = False,
+        query_cache_size: int = 0,
+        mmap: bool = False,
     ):
         super().__init__()
 
@@ -112,11 +142,29 @@ class FAISSRetriever(
         self.embedder = embedder  # used to vectorize the queries
         self.top_k = top_k
         self.metric = metric
+        self.index_factory = index_factory
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        self.ef_construction = ef_construction
+        self.min_train_size = min_train_size
+        if vector_dtype != "fp32" and vector_dtype not in _VECTOR_DTYPE_TO_SQ_FACTORY:
+            raise ValueError(f"Invalid vector_dtype: {vector_dtype}")
+        self.vector_dtype = vector_dtype
+        self.use_gpu = use_gpu
+        self._gpu_resources = None  # created on the first copy to the GPU
+        self.mmap = mmap
+        self.query_cache_size = query_cache_size
+        # query string -> embedding, the embedder is fixed per retriever
+        self._query_embedding_cache: Optional[ResponseCache] = (
+            ResponseCache(max_size=query_cache_size) if query_cache_size > 0 else None
+        )
         if self.metric == "cosine" or self.metric == "prob":
             self._faiss_index_type = faiss.IndexFlatIP
+            self._faiss_metric_type = faiss.METRIC_INNER_PRODUCT
             self._needs_normalized_embeddings = True
         elif self.metric == "euclidean":
             self._faiss_index_type = faiss.IndexFlatL2
+            self._faiss_metric_type = faiss.METRIC_L2
             self._needs_normalized_embeddings = False
         else:
             raise ValueError(f"Invalid metric: {self.metric}")
@@ -143,8 +191,134 @@ class FAISSRetriever(
             ), f"Dimension mismatch: {self.dimensions} != {self.xb.shape[1]}"
         self.total_documents = xb.shape[0]
 
-        self.index = self._faiss_index_type(self.dimensions)
-        self.index.add(xb)
+        index = self._create_faiss_index(xb)
+        index.add(xb)
+        self.index = self._to_gpu(index) if self.use_gpu else index
+        self.indexed = True
+
+    def _to_gpu(self, index: faiss.Index) -> faiss.Index:
+        r"""Copy the index to the first GPU, or return the index when no GPU is available."""
+        if not hasattr(faiss, "StandardGpuResources") or faiss.get_num_gpus() == 0:
+            log.warning("faiss-gpu or a GPU is not available, using the CPU index")
+            return index
+        if self._gpu_resources is None:
+            self._gpu_resources = faiss.StandardGpuResources()
+        return faiss.index_cpu_to_gpu(self._gpu_resources, 0, index)
+
+    def _create_faiss_index(self, xb: np.ndarray) -> faiss.Index:
+        r"""Create the index from ``index_factory`` and train it on xb, or the flat index."""
+        if not self.index_factory:
+            return self._create_flat_index(xb)
+
+        index = faiss.index_factory(
+            self.dimensions, self.index_factory, self._faiss_metric_type
+        )
+        if not index.is_trained:
+            if xb.shape[0] < self.min_train_size:
+                log.info(
+                    f"{xb.shape[0]} chunks are less than min_train_size {self.min_train_size}, using the flat index instead of {self.index_factory}"
+                )
+                return self._create_flat_index(xb)
+            index.train(xb)
+        if self.ef_construction is not None:
+            hnsw_index = faiss.downcast_index(index)
+            if hasattr(hnsw_index, "hnsw"):
+                hnsw_index.hnsw.efConstruction = self.ef_construction
+            else:
+                log.warning("ef_construction is ignored, the index is not HNSW")
+        self._set_search_params(index)
+        return index
+
+    def _create_flat_index(self, xb: np.ndarray) -> faiss.Index:
+        r"""Create the exhaustive search index, with a scalar quantizer trained on xb for fp16 and int8."""
+        if self.vector_dtype == "fp32":
+            return self._faiss_index_type(self.dimensions)
+        index = faiss.index_factory(
+            self.dimensions,
+            _VECTOR_DTYPE_TO_SQ_FACTORY[self.vector_dtype],
+            self._faiss_metric_type,
+        )
+        index.train(xb)
+        return index
+
+    def _set_search_params(self, index: faiss.Index):
+        r"""Set efSearch of the HNSW index, or nprobe and the efSearch of the HNSW coarse quantizer of the IVF index."""
+        if self.nprobe is None and self.ef_search is None:
+            return
+        hnsw_index = faiss.downcast_index(index)
+        if hasattr(hnsw_index, "hnsw"):
+            if self.ef_search is not None:
+                hnsw_index.hnsw.efSearch = self.ef_search
+            return
+        try:
+            ivf = faiss.extract_index_ivf(index)
+        except RuntimeError:
+            log.warning(
+                "nprobe and ef_search are ignored, the index is not an IVF index"
+            )
+            return
+        if self.nprobe is not None:
+            ivf.nprobe = self.nprobe
+        if self.ef_search is not None:
+            quantizer = faiss.downcast_index(ivf.quantizer)
+            if hasattr(quantizer, "hnsw"):
+                quantizer.hnsw.efSearch = self.ef_search
+            else:
+                log.warning("ef_search is ignored, the coarse quantizer is not HNSW")
+
+    def save_to_file(self, path: str):
+        r"""Save the index, including the trained quantizers, with ``faiss.write_index``.
+
+        Only the index is saved, the documents are not. The file is replaced atomically,
+        so an index memory-mapped from the same path stays valid.
+        """
+        if not self.indexed:
+            raise ValueError("Index is not built. Nothing to save")
+        try:
+            index = self.index
+            if self.use_gpu and hasattr(faiss, "index_gpu_to_cpu"):
+                index = faiss.index_gpu_to_cpu(index)
+            tmp_path = f"{path}.tmp"
+            faiss.write_index(index, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            log.error(f"Error saving the index to file: {e}")
+            raise e
+
+    @classmethod
+    def load_from_file(cls, path: str, **kwargs) -> "FAISSRetriever":
+        r"""Load the index saved by :meth:`save_to_file` without re-training it.
+
+        Args:
+            path (str): The index file path.
+            **kwargs: The arguments to initialize the retriever, such as ``embedder``, ``top_k`` and ``metric``.
+        """
+        instance = cls(**kwargs)
+        instance.load_index(path)
+        return instance
+
+    def load_index(self, path: str):
+        r"""Replace the index with the one saved by :meth:`save_to_file`, memory-mapped with ``mmap``."""
+        io_flags = 0
+        if self.mmap and not self.use_gpu:
+            io_flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+        try:
+            index = faiss.read_index(path, io_flags)
+        except Exception as e:
+            log.error(f"Error loading the index from file: {e}")
+            raise e
+        if self.dimensions:
+            assert (
+                self.dimensions == index.d
+            ), f"Dimension mismatch: {self.dimensions} != {index.d}"
+        self.dimensions = index.d
+        self._set_search_params(index)
+        self.index = self._to_gpu(index) if self.use_gpu else index
+        self.total_documents = index.ntotal
+        if io_flags:
+            # the vectors are paged in from the file, release the in-memory copies
+            self.xb = None
+            self.documents = None
         self.indexed = True
 
     def build_index_from_documents(
@@ -177,7 +351,8 @@ class FAISSRetriever(
                 ), "All embeddings should be of the same size"
                 self.xb = np.array(documents, dtype=np.float32)
             else:
-                self.xb = documents
+                # faiss takes C-contiguous float32 arrays
+                self.xb = np.ascontiguousarray(documents, dtype=np.float32)
             if self._needs_normalized_embeddings:
                 first_vector = self.xb[0]
                 if not is_normalized(first_vector):
@@ -234,12 +409,9 @@ class FAISSRetriever(
             raise ValueError(
                 "Index is empty. Please set the chunks to build the index from"
             )
-        # check if the input is List, convert to numpy array
+        # convert to a C-contiguous float32 array, which faiss search takes
         try:
-            if not isinstance(input, np.ndarray):
-                xq = np.array(input, dtype=np.float32)
-            else:
-                xq = input
+            xq = np.ascontiguousarray(input, dtype=np.float32)
         except Exception as e:
             log.error(f"Error converting input to numpy array: {e}")
             raise e
@@ -279,16 +451,28 @@ class FAISSRetriever(
                 continue
             valid_queries.append(q)
             record_map[len(valid_queries) - 1] = i
-        # embed the queries, assume the length fits into a batch.
-        try:
-            embeddings: EmbedderOutputType = self.embedder(valid_queries)
-            queries_embeddings: List[List[float]] = [
-                data.embedding for data in embeddings.data
+        queries_embeddings: List[Optional[List[float]]] = [None] * len(valid_queries)
+        if self._query_embedding_cache is not None:
+            queries_embeddings = [
+                self._query_embedding_cache.get(q) for q in valid_queries
             ]
-
-        except Exception as e:
-            log.error(f"Error embedding queries: {e}")
-            raise e
+        missing = [i for i, emb in enumerate(queries_embeddings) if emb is None]
+        # embed the queries not in the cache, assume the length fits into a batch.
+        if missing:
+            try:
+                embeddings: EmbedderOutputType = self.embedder(
+                    [valid_queries[i] for i in missing]
+                )
+                for i, data in zip(missing, embeddings.data):
+                    queries_embeddings[i] = data.embedding
+                    if self._query_embedding_cache is not None:
+                        self._query_embedding_cache.set(
+                            valid_queries[i], data.embedding
+                        )
+
+            except Exception as e:
+                log.error(f"Error embedding queries: {e}")
+                raise e
         xq = np.array(queries_embeddings, dtype=np.float32)
         D, Ind = self.index.search(xq, top_k if top_k else self.top_k)
         D = self._convert_cosine_similarity_to_probability(D)
@@ -347,6 +531,14 @@ class FAISSRetriever(
             s += f", metric={self.metric}"
         if self.dimensions:
             s += f", dimensions={self.dimensions}"
+        if self.vector_dtype != "fp32":
+            s += f", vector_dtype={self.vector_dtype}"
+        if self.index_factory:
+            s += f", index_factory={self.index_factory}"
+        if self.nprobe:
+            s += f", nprobe={self.nprobe}"
+        if self.ef_search:
+            s += f", ef_search={self.ef_search}"
         if self.documents:
             s += f", total_documents={self.total_documents}"
         return s
@@ -10,6 +10,7 @@ from .parameter import Parameter
 from .prompt_builder import Prompt
 
 from .retriever import Retriever
+from .semantic_cache import SemanticCache
 from .tokenizer import Tokenizer
 
 
@@ -62,6 +63,7 @@ __all__ = [
     "Embedder",
     "BatchEmbedder",
     "Retriever",
+    "SemanticCache",
     "GeneratorOutput",
     "GeneratorOutputType",
     "ModelType",
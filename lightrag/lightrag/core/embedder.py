@@ -1,6 +1,7 @@
 r"""The component that orchestrates model client (Embedding models in particular) and output processors."""
 
 from typing import Optional, Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from tqdm import tqdm
 
@@ -197,12 +198,16 @@ class BatchEmbedder(Component):
     Args:
         embedder (Embedder): The embedder to use for batching.
         batch_size (int, optional): The batch size to use for batching. Defaults to 100.
+        max_concurrency (int, optional): The max number of batches sent at the same time from a thread pool. Defaults to 1, which sends them one by one.
     """
 
-    def __init__(self, embedder: Embedder, batch_size: int = 100) -> None:
-        super().__init__(batch_size=batch_size)
+    def __init__(
+        self, embedder: Embedder, batch_size: int = 100, max_concurrency: int = 1
+    ) -> None:
+        super().__init__(batch_size=batch_size, max_concurrency=max_concurrency)
         self.embedder = embedder
         self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
 
     def call(
         self, input: BatchEmbedderInputType, model_kwargs: Optional[Dict] = {}
@@ -221,14 +226,29 @@ class BatchEmbedder(Component):
         if isinstance(input, str):
             input = [input]
         n = len(input)
-        embeddings: List[EmbedderOutputType] = []
-        for i in tqdm(
-            range(0, n, self.batch_size),
-            desc="Batch embedding documents",
-        ):
-            batch_input = input[i : i + self.batch_size]
-            batch_output = self.embedder.call(
-                input=batch_input, model_kwargs=model_kwargs
+        batch_inputs = [
+            input[i : i + self.batch_size] for i in range(0, n, self.batch_size)
+        ]
+
+        def embed_batch(batch_input: List[str]) -> EmbedderOutputType:
+            return self.embedder.call(input=batch_input, model_kwargs=model_kwargs)
+
+        if self.max_concurrency <= 1 or len(batch_inputs) <= 1:
+            return [
+                embed_batch(batch_input)
+                for batch_input in tqdm(
+                    batch_inputs, desc="Batch embedding documents"
+                )
+            ]
+        # the batches are I/O bound API calls, map keeps the output in the input order
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(batch_inputs))
+        ) as executor:
+            embeddings: List[EmbedderOutputType] = list(
+                tqdm(
+                    executor.map(embed_batch, batch_inputs),
+                    total=len(batch_inputs),
+                    desc="Batch embedding documents",
+                )
             )
-            embeddings.append(batch_output)
         return embeddings
@@ -878,11 +878,21 @@ def normalize_vector(v: VECTOR_TYPE) -> List[float]:
 def get_top_k_indices_scores(
     scores: Union[List[float], np.ndarray], top_k: int
 ) -> Tuple[List[int], List[float]]:
-    if isinstance(scores, list):
-        scores_np = np.array(scores)
+    r"""Get the indices and scores of the top_k highest scores, in descending order.
+
+    It selects the top_k with ``np.argpartition`` in linear time and only sorts those,
+    instead of sorting all the scores.
+    """
+    scores_np = np.asarray(scores)
+    n = scores_np.shape[0]
+    top_k = min(top_k, n)
+    if top_k <= 0:
+        return [], []
+    if top_k < n:
+        top_k_indices = np.argpartition(scores_np, n - top_k)[n - top_k :]
     else:
-        scores_np = scores
-    top_k_indices = np.argsort(scores_np)[-top_k:][::-1]
+        top_k_indices = np.arange(n)
+    top_k_indices = top_k_indices[np.argsort(scores_np[top_k_indices])[::-1]]
     top_k_scores = scores_np[top_k_indices]
     return top_k_indices.tolist(), top_k_scores.tolist()
 
@@ -3,7 +3,7 @@
 It is a pipeline that consists of three subcomponents."""
 
 from typing import Any, Dict, List, Optional, Union
-from copy import deepcopy
+from types import GeneratorType
 import logging
 
 from lightrag.core.types import (
@@ -14,7 +14,7 @@ from lightrag.core.types import (
 from lightrag.core.component import Component
 from lightrag.core.parameter import Parameter
 from lightrag.core.prompt_builder import Prompt
-from lightrag.core.model_client import ModelClient
+from lightrag.core.model_client import ModelClient, ResponseCache
 from lightrag.core.default_prompt_template import DEFAULT_LIGHTRAG_SYSTEM_PROMPT
 
 
@@ -38,6 +38,7 @@ class Generator(Component):
         prompt_kwargs (Optional[Dict], optional): The preset prompt kwargs to fill in the variables in the prompt. Defaults to None.
         output_processors (Optional[Component], optional):  The output processors after model call. It can be a single component or a chained component via ``Sequential``. Defaults to None.
         trainable_params (Optional[List[str]], optional): The list of trainable parameters. Defaults to [].
+        use_cache (bool, optional): Cache the output by the hash of the api_kwargs and skip the model client call on the same api_kwargs. Streaming calls are not cached. Defaults to False.
 
     Note:
         The output_processors will be applied to the string output of the model completion. And the result will be stored in the data field of the output. And we encourage you to only use it to parse the response to data format you will use later.
@@ -59,6 +60,8 @@ class Generator(Component):
         output_processors: Optional[Component] = None,
         # args for the trainable parameters
         trainable_params: Optional[List[str]] = [],
+        # args for the response cache
+        use_cache: bool = False,
     ) -> None:
         r"""The default prompt is set to the DEFAULT_LIGHTRAG_SYSTEM_PROMPT. It has the following variables:
         - task_desc_str
@@ -77,17 +80,15 @@ class Generator(Component):
             )
 
         template = template or DEFAULT_LIGHTRAG_SYSTEM_PROMPT
-        try:
-            prompt_kwargs = deepcopy(prompt_kwargs)
-        except Exception as e:
-            log.warning(f"Error copying the prompt_kwargs: {e}")
-            prompt_kwargs = prompt_kwargs
+        # a shallow copy is enough to not modify the caller's dict, the values such as Parameter are shared
+        prompt_kwargs = dict(prompt_kwargs or {})
 
         super().__init__(
             model_kwargs=model_kwargs,
             template=template,
             prompt_kwargs=prompt_kwargs,
             trainable_params=trainable_params,
+            use_cache=use_cache,
         )
 
         self._init_prompt(template, prompt_kwargs)
@@ -98,6 +99,11 @@ class Generator(Component):
 
         self.output_processors = output_processors
 
+        self.use_cache = use_cache
+        self._response_cache: Optional[ResponseCache] = (
+            ResponseCache() if use_cache else None
+        )
+
         # add trainable_params to generator
         prompt_variables = self.prompt.get_prompt_variables()
         self._trainable_params: List[str] = []
@@ -164,18 +170,25 @@ class Generator(Component):
 
     def _post_call(self, completion: Any) -> GeneratorOutputType:
         r"""Get string completion and process it with the output_processors."""
+        # subcomponents are resolved via Component.__getattr__, look them up once per call
+        output_processors = self.output_processors
         try:
             response = self.model_client.parse_chat_completion(completion)
         except Exception as e:
             log.error(f"Error parsing the completion {completion}: {e}")
             return GeneratorOutput(raw_response=str(completion), error=str(e))
 
+        # the output processors operate on the str, so the streamed chunks are accumulated
+        # as they arrive, without them the stream is returned to the caller as is.
+        if output_processors and isinstance(response, GeneratorType):
+            response = "".join(chunk for chunk in response if chunk)
+
         # the output processors operate on the str, the raw_response field.
         output: GeneratorOutputType = GeneratorOutput(raw_response=response)
 
-        if self.output_processors:
+        if output_processors:
             try:
-                response = self.output_processors(response)
+                response = output_processors(response)
                 output.data = response
             except Exception as e:
                 log.error(f"Error processing the output processors: {e}")
@@ -201,6 +214,31 @@ class Generator(Component):
         )
         return api_kwargs
 
+    def _compose_prompt_kwargs(self, prompt_kwargs: Optional[Dict]) -> Dict:
+        r"""Add the trained parameters to the prompt_kwargs in training mode.
+
+        Returns a new dict so that the caller's prompt_kwargs is not modified.
+        """
+        prompt_kwargs = prompt_kwargs or {}
+        if not self.training:
+            return prompt_kwargs
+        # convert attributes to prompt_kwargs
+        trained_prompt_kwargs = {
+            param: getattr(self, param).data for param in self.state_dict()
+        }
+        return {**prompt_kwargs, **trained_prompt_kwargs}
+
+    def _get_cache_key(self, api_kwargs: Dict) -> Optional[str]:
+        r"""Get the response cache key, None when the cache is not used for this call."""
+        if self._response_cache is None or api_kwargs.get("stream", False):
+            return None
+        return ResponseCache.hash_key(api_kwargs)
+
+    def _set_cache(self, cache_key: Optional[str], output: GeneratorOutputType):
+        r"""Only cache the successful output."""
+        if cache_key is not None and output is not None and output.error is None:
+            self._response_cache.set(cache_key, output)
+
     def call(
         self,
         prompt_kwargs: Optional[Dict] = {},  # the input need to be passed to the prompt
@@ -211,19 +249,19 @@ class Generator(Component):
         and passing the combined model_kwargs to the model client.
         """
 
-        if self.training:
-            # add the parameters to the prompt_kwargs
-            # convert attributes to prompt_kwargs
-            trained_prompt_kwargs = {
-                param: getattr(self, param).data for param in self.state_dict()
-            }
-            prompt_kwargs.update(trained_prompt_kwargs)
+        prompt_kwargs = self._compose_prompt_kwargs(prompt_kwargs)
 
         log.debug(f"prompt_kwargs: {prompt_kwargs}")
         log.debug(f"model_kwargs: {model_kwargs}")
 
         api_kwargs = self._pre_call(prompt_kwargs, model_kwargs)
         log.debug(f"api_kwargs: {api_kwargs}")
+        cache_key = self._get_cache_key(api_kwargs)
+        if cache_key is not None:
+            cached_output = self._response_cache.get(cache_key)
+            if cached_output is not None:
+                log.debug(f"cache hit: {cache_key}")
+                return cached_output
         output: GeneratorOutputType = None
         # call the model client
         completion = None
@@ -242,10 +280,10 @@ class Generator(Component):
                 log.error(f"Error processing the output: {e}")
                 output = GeneratorOutput(raw_response=str(completion), error=str(e))
 
+        self._set_cache(cache_key, output)
         log.info(f"output: {output}")
         return output
 
-    # TODO: training is not supported in async call yet
     async def acall(
         self,
         prompt_kwargs: Optional[Dict] = {},
@@ -253,13 +291,19 @@ class Generator(Component):
     ) -> GeneratorOutputType:
         r"""Async call the model with the input and model_kwargs.
 
-        :warning::
-            Training is not supported in async call yet.
+        Safe to run concurrently, e.g. with ``asyncio.gather``, as the passed prompt_kwargs is not modified.
         """
+        prompt_kwargs = self._compose_prompt_kwargs(prompt_kwargs)
         log.info(f"prompt_kwargs: {prompt_kwargs}")
         log.info(f"model_kwargs: {model_kwargs}")
 
         api_kwargs = self._pre_call(prompt_kwargs, model_kwargs)
+        cache_key = self._get_cache_key(api_kwargs)
+        if cache_key is not None:
+            cached_output = self._response_cache.get(cache_key)
+            if cached_output is not None:
+                log.debug(f"cache hit: {cache_key}")
+                return cached_output
         output: GeneratorOutputType = None
         # call the model client
         completion = None
@@ -279,6 +323,7 @@ class Generator(Component):
                 log.error(f"Error processing the output: {e}")
                 output = GeneratorOutput(raw_response=str(completion), error=str(e))
 
+        self._set_cache(cache_key, output)
         log.info(f"output: {output}")
         return output
 
@@ -1,11 +1,142 @@
 r"""ModelClient is the protocol and base class for all models(either via APIs or local models) to communicate with components."""
 
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+from collections import OrderedDict
+from weakref import WeakValueDictionary
+import hashlib
+import json
+import threading
+import time
 
 
 from lightrag.core.component import Component
 from lightrag.core.types import ModelType, EmbedderOutput
 
+try:  # optional, faster serialization of the large api_kwargs
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# replace the line breaks and tabs with spaces in a single pass
+_WHITESPACE_TO_SPACE = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
+
+
+def _serialize_api_kwargs(api_kwargs: Dict) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                api_kwargs,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+                default=str,
+            )
+        except TypeError:  # e.g. int over 64 bits, fall back to json
+            pass
+    return json.dumps(api_kwargs, sort_keys=True, default=str).encode("utf-8")
+
+
+T = TypeVar("T")
+
+# the initialized SDK clients, an entry is dropped once no model client uses it
+_SYNC_CLIENT_CACHE: "WeakValueDictionary[Tuple[str, str], Any]" = WeakValueDictionary()
+_SYNC_CLIENT_CACHE_LOCK = threading.Lock()
+
+
+def get_cached_sync_client(
+    provider: str, init_client: Callable[..., T], **client_kwargs: Any
+) -> T:
+    r"""Get the SDK client of the provider and client kwargs, or create it with ``init_client``.
+
+    Model clients with the same provider and client kwargs, such as ``api_key`` and ``base_url``,
+    share one SDK client along with its connection pool, e.g. when a ``Generator`` is created
+    per task instance. It is thread-safe.
+
+    Args:
+        provider (str): The provider name, such as the model client class name.
+        init_client (Callable[..., T]): Creates the SDK client with ``client_kwargs`` on a cache miss.
+        **client_kwargs: The kwargs the SDK client is created with, only their hash is kept in the key.
+    """
+    key = (provider, hashlib.sha256(_serialize_api_kwargs(client_kwargs)).hexdigest())
+    with _SYNC_CLIENT_CACHE_LOCK:
+        client = _SYNC_CLIENT_CACHE.get(key)
+        if client is None:
+            client = init_client(**client_kwargs)
+            _SYNC_CLIENT_CACHE[key] = client
+        return client
+
+
+class ResponseCache:
+    __doc__ = r"""In-memory LRU cache with optional time-to-live for model responses.
+
+    It is used by ``Generator`` with ``use_cache=True`` to skip the model client call when
+    the exact same ``api_kwargs`` were already sent. Use :meth:`hash_key` to compute the key.
+
+    Args:
+        max_size (int, optional): Maximum number of entries, the least recently used entry is evicted first. Defaults to 1024.
+        ttl (Optional[float], optional): Seconds before an entry expires. Defaults to None, which never expires.
+
+    Example:
+
+    .. code-block:: python
+
+        cache = ResponseCache(max_size=2)
+        key = ResponseCache.hash_key({"model": "gpt-3.5-turbo", "messages": []})
+        cache.set(key, "response")
+        cache.get(key)  # "response"
+        print(cache.cache_read, cache.cache_write)  # 1 1
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._store: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self.cache_read = 0  # number of hits
+        self.cache_write = 0  # number of stored entries
+
+    @staticmethod
+    def hash_key(api_kwargs: Dict) -> str:
+        r"""Hash the api_kwargs with blake2b, keys are sorted so the order does not matter.
+
+        It uses ``orjson`` to serialize the api_kwargs when it is installed.
+        """
+        serialized = _serialize_api_kwargs(api_kwargs)
+        return hashlib.blake2b(serialized, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        r"""Get the value by key, returns None if the key is missing or expired."""
+        item = self._store.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._store[key]
+            return None
+        self._store.move_to_end(key)
+        self.cache_read += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        r"""Set the value by key. ``ttl`` overwrites the default ttl of the cache."""
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._store[key] = (value, expires_at)
+        self._store.move_to_end(key)
+        self.cache_write += 1
+        while len(self._store) > self.max_size:
+            self._store.popitem(last=False)
+
+    def clear(self) -> None:
+        r"""Remove all entries and reset the counters."""
+        self._store.clear()
+        self.cache_read = 0
+        self.cache_write = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __repr__(self) -> str:
+        return f"ResponseCache(max_size={self.max_size}, ttl={self.ttl}, size={len(self)}, cache_read={self.cache_read}, cache_write={self.cache_write})"
+
 
 # TODO: global model registry for all available models in users' project.
 class ModelClient(Component):
@@ -63,7 +194,7 @@ Check the subclasses in `components/model_client/` directory for the functional
         self, api_kwargs: Dict = {}, model_type: ModelType = ModelType.UNDEFINED
     ):
         r"""Subclass use this to call the API with the async client."""
-        pass
+        raise NotImplementedError(f"{type(self).__name__} must implement acall method")
 
     def convert_inputs_to_api_kwargs(
         self,
@@ -101,11 +232,11 @@ Check the subclasses in `components/model_client/` directory for the functional
         """
         This is specific to OpenAI API, as removing new lines could have better performance in the embedder
         """
-        text = text.replace("\n", " ")
-        return text
+        return text.translate(_WHITESPACE_TO_SPACE)
 
     def _track_usage(self, **kwargs):
         pass
 
     def __call__(self, *args, **kwargs):
-        return super().__call__(*args, **kwargs)
+        # Component.__call__ only forwards to call, skip the extra frame on the hot path
+        return self.call(*args, **kwargs)
@@ -1,6 +1,6 @@
 """Class prompt builder for LightRAG system prompt."""
 
-from typing import Dict, Any, Optional, List, TypeVar
+from typing import Dict, Any, Optional, List, TypeVar, Tuple, FrozenSet
 import logging
 from functools import lru_cache
 
@@ -32,6 +32,49 @@ def get_jinja2_environment():
         raise ValueError(f"Invalid Jinja2 environment: {e}")
 
 
+@lru_cache(maxsize=512)
+def compile_jinja2_template(template: str) -> Template:
+    r"""Compile the template string once and share the Template object across Prompt instances."""
+    try:
+        return get_jinja2_environment().from_string(template)
+    except Exception as e:
+        raise ValueError(f"Invalid Jinja2 template: {e}")
+
+
+@lru_cache(maxsize=512)
+def _find_template_variables(template: str) -> FrozenSet[str]:
+    return frozenset(
+        meta.find_undeclared_variables(get_jinja2_environment().parse(template))
+    )
+
+
+# the prompt kwargs values that can be used as a part of the render cache key
+_CACHEABLE_TYPES = (str, int, float, bool, type(None))
+
+
+@lru_cache(maxsize=2048)
+def _render_cached(
+    template: str, frozen_kwargs: Tuple[Tuple[str, type, Any], ...]
+) -> str:
+    kwargs = {key: value for key, _, value in frozen_kwargs}
+    return compile_jinja2_template(template).render(**kwargs)
+
+
+def render_jinja2_template(template: str, **kwargs) -> str:
+    r"""Render the template string with the kwargs.
+
+    The rendered string is memoized when all the values are primitives, as a rendering is
+    deterministic given the template and the kwargs.
+    """
+    if all(isinstance(value, _CACHEABLE_TYPES) for value in kwargs.values()):
+        # the type is a part of the key as 1 == 1.0 == True but they render differently
+        frozen_kwargs = tuple(
+            (key, type(value), value) for key, value in sorted(kwargs.items())
+        )
+        return _render_cached(template, frozen_kwargs)
+    return compile_jinja2_template(template).render(**kwargs)
+
+
 class Prompt(Component):
     __doc__ = r"""Renders a text string(prompt) from a Jinja2 template string.
 
@@ -83,12 +126,7 @@ class Prompt(Component):
 
     def __create_jinja2_template(self):
         r"""Create the Jinja2 template object."""
-        try:
-            self.jinja2_template: Template = get_jinja2_environment().from_string(
-                self.template
-            )
-        except Exception as e:
-            raise ValueError(f"Invalid Jinja2 template: {e}")
+        self.jinja2_template: Template = compile_jinja2_template(self.template)
 
     def update_prompt_kwargs(self, **kwargs):
         r"""Update the initial prompt kwargs after Prompt is initialized."""
@@ -104,8 +142,7 @@ class Prompt(Component):
 
     def _find_template_variables(self, template_str: str):
         """Automatically find all the variables in the template."""
-        parsed_content = self.jinja2_template.environment.parse(template_str)
-        return meta.find_undeclared_variables(parsed_content)
+        return _find_template_variables(template_str)
 
     def compose_prompt_kwargs(self, **kwargs) -> Dict:
         r"""Compose the final prompt kwargs by combining the initial and the provided kwargs at runtime."""
@@ -145,7 +182,7 @@ class Prompt(Component):
         try:
             pass_kwargs = self.compose_prompt_kwargs(**kwargs)
 
-            prompt_str = self.jinja2_template.render(**pass_kwargs)
+            prompt_str = render_jinja2_template(self.template, **pass_kwargs)
             return prompt_str
 
         except Exception as e:
@@ -163,7 +200,7 @@ class Prompt(Component):
     def from_dict(cls: type[T], data: Dict[str, Any]) -> T:
         obj = super().from_dict(data)
         # recreate the jinja2 template
-        obj.jinja2_template = get_jinja2_environment().from_string(obj.template)
+        obj.jinja2_template = compile_jinja2_template(obj.template)
         return obj
 
     def to_dict(self) -> Dict[str, Any]:
@@ -0,0 +1,123 @@
+r"""Semantic cache that matches near-duplicate queries by the cosine similarity of their embeddings.
+
+Different from ``ResponseCache`` which only hits on exactly the same ``api_kwargs``, it returns
+the cached response of a previous query that is paraphrased, e.g. "What is the capital of France?"
+and "what's the capital city of France".
+"""
+
+from typing import Any, List, Optional
+import logging
+
+import numpy as np
+
+from lightrag.core.component import Component
+from lightrag.core.embedder import Embedder
+from lightrag.core.types import EmbedderOutput
+
+log = logging.getLogger(__name__)
+
+__all__ = ["SemanticCache"]
+
+
+class SemanticCache(Component):
+    __doc__ = r"""Cache values by the embedding of the query, and hit on the most similar cached query.
+
+    The embeddings are normalized and stored in a fixed size matrix, a lookup is one matrix-vector
+    product, which is the same as a flat inner product index. When it is full, the oldest entry is replaced.
+
+    Args:
+        embedder (Embedder): The embedder to embed the query, a cheap (local) embedding model is preferred.
+        threshold (float, optional): The min cosine similarity to count as a hit. Defaults to 0.95.
+        max_size (int, optional): The max number of cached entries. Defaults to 1024.
+
+    Example:
+
+    .. code-block:: python
+
+        cache = SemanticCache(embedder=embedder, threshold=0.95)
+
+        embedding = cache.embed(query)
+        output = cache.get(embedding)
+        if output is None:
+            output = generator(prompt_kwargs={"input_str": query})
+            if output.error is None:
+                cache.set(embedding, output)
+    """
+
+    def __init__(
+        self, embedder: Embedder, threshold: float = 0.95, max_size: int = 1024
+    ):
+        super().__init__(threshold=threshold, max_size=max_size)
+        if max_size <= 0:
+            raise ValueError(f"max_size must be positive, got {max_size}")
+        self.embedder = embedder
+        self.threshold = threshold
+        self.max_size = max_size
+        self._embeddings: Optional[np.ndarray] = None  # (max_size, dim), lazily created
+        self._values: List[Any] = []
+        self._next = 0  # the slot to write next once the cache is full
+        self.cache_read = 0
+
+    def _normalize(self, embedding: Any) -> np.ndarray:
+        embedding = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else embedding
+
+    def _get_embedding(self, output: EmbedderOutput) -> Optional[np.ndarray]:
+        if output.error is not None or not output.data:
+            log.error(f"Error embedding the query: {output.error}")
+            return None
+        return self._normalize(output.data[0].embedding)
+
+    def embed(self, query: str) -> Optional[np.ndarray]:
+        r"""Embed and normalize the query. Returns None if the embedder fails."""
+        return self._get_embedding(self.embedder(input=query))
+
+    async def aembed(self, query: str) -> Optional[np.ndarray]:
+        return self._get_embedding(await self.embedder.acall(input=query))
+
+    async def aembed_batch(self, queries: List[str]) -> List[Optional[np.ndarray]]:
+        r"""Embed and normalize the queries in one embedder call. Returns all None if the embedder fails."""
+        output = await self.embedder.acall(input=queries)
+        if output.error is not None or len(output.data) != len(queries):
+            log.error(f"Error embedding the queries: {output.error}")
+            return [None] * len(queries)
+        return [self._normalize(data.embedding) for data in output.data]
+
+    def get(self, embedding: Optional[np.ndarray]) -> Optional[Any]:
+        r"""Get the value of the most similar cached query if its similarity is at least the threshold."""
+        if embedding is None or not self._values:
+            return None
+        scores = self._embeddings[: len(self._values)] @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        self.cache_read += 1
+        log.debug(f"semantic cache hit, similarity: {scores[best]}")
+        return self._values[best]
+
+    def set(self, embedding: Optional[np.ndarray], value: Any) -> None:
+        if embedding is None:
+            return
+        if self._embeddings is None:
+            self._embeddings = np.zeros(
+                (self.max_size, embedding.shape[0]), dtype=np.float32
+            )
+        if len(self._values) < self.max_size:
+            self._embeddings[len(self._values)] = embedding
+            self._values.append(value)
+        else:
+            self._embeddings[self._next] = embedding
+            self._values[self._next] = value
+            self._next = (self._next + 1) % self.max_size
+
+    def clear(self) -> None:
+        self._embeddings = None
+        self._values = []
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _extra_repr(self) -> str:
+        return f"threshold={self.threshold}, max_size={self.max_size}, size={len(self)}"
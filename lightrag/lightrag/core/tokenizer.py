@@ -3,6 +3,7 @@ Tokenizer from tiktoken.
 """
 import tiktoken
 from typing import List
+from functools import lru_cache
 
 from lightrag.core.component import Component
 
@@ -49,7 +50,30 @@ class Tokenizer(Component):
         r"""Counts the number of tokens in the input text."""
         return len(self.encode(text))
 
+    def count_prompt_tokens(self, prompt: str) -> int:
+        r"""Counts the tokens of a prompt, the static ``<SYS></SYS>`` section is counted once and cached.
+
+        The prefix and the rest are encoded separately, so it can differ from ``count_tokens`` by a token at the boundary.
+        """
+        prefix, sep, suffix = prompt.partition("</SYS>")
+        if not sep:
+            return self.count_tokens(prompt)
+        return _count_tokens_cached(self.name, prefix + sep) + self.count_tokens(
+            suffix
+        )
+
     def get_string_tokens(self, text: str) -> List[str]:
         r"""Returns the string tokens from the input text."""
         token_ids = self.encode(text)
         return [self.tokenizer.decode([token_id]) for token_id in token_ids]
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(name: str = "cl100k_base") -> Tokenizer:
+    r"""Get the shared Tokenizer of the encoding, instead of creating one per text."""
+    return Tokenizer(name=name)
+
+
+@lru_cache(maxsize=4096)
+def _count_tokens_cached(name: str, text: str) -> int:
+    return get_tokenizer(name).count_tokens(text)
@@ -1,7 +1,7 @@
 """This is the metric for evaluating the relevance of the retrieved context."""
 
 from typing import List, Union, Tuple
-from lightrag.core.tokenizer import Tokenizer
+from lightrag.core.tokenizer import get_tokenizer
 
 
 class RetrieverRelevance:
@@ -49,7 +49,7 @@ class RetrieverRelevance:
         if isinstance(gt_context, str):
             gt_context = [gt_context]
         relevant_tokens = 0
-        tokenizer = Tokenizer()
+        tokenizer = get_tokenizer()
         for gt_context_sentence in gt_context:
             if gt_context_sentence in retrieved_context:
                 relevant_tokens += tokenizer.count_tokens(gt_context_sentence)
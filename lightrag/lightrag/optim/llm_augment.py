@@ -9,6 +9,7 @@ import logging
 from lightrag.core.model_client import ModelClient
 from lightrag.core import Generator, GeneratorOutput
 from lightrag.core.component import Component
+from lightrag.core.prompt_builder import Prompt
 from lightrag.core.base_data_class import DataClass
 from lightrag.core.string_parser import YamlParser
 
@@ -16,7 +17,8 @@ from lightrag.components.output_parsers import YAML_OUTPUT_FORMAT
 
 log = logging.getLogger(__name__)
 
-LLM_AUGMENTER_TEMPLATE = r"""Given inputs and outputs, you will fill in any field that is missing value.
+# the static part of the prompt, it is rendered once in the LLMAugmenter
+LLM_AUGMENTER_SYSTEM_TEMPLATE = r"""Given inputs and outputs, you will fill in any field that is missing value.
 - null or '' means the field is missing.
 - Understand the reasoning between inputs and outputs fields. If the 'thought/reasoning' field is null, you will fill in the reasoning
   between the inputs and existing outputs and explain it well.
@@ -36,8 +38,11 @@ answer: "Paris"
 Your answer:
 thought: "I know the capital of France is Paris."
 </EXAMPLES>
+"""
 
-
+LLM_AUGMENTER_TEMPLATE = r"""<SYS>
+{{system_str}}
+</SYS>
 <Inputs>
 {{input_str}}
 </Inputs>
@@ -60,16 +65,21 @@ class LLMAugmenter(Component):
         r"""Initialize the generator with the model client and the model kwargs."""
         super().__init__()
         # overwrite temperature to 1
-        model_kwargs["temperature"] = 1
+        model_kwargs = {**model_kwargs, "temperature": 1}
+        # the system section only depends on the task context, render it once instead of on every call
+        system_str = Prompt(
+            template=LLM_AUGMENTER_SYSTEM_TEMPLATE,
+            prompt_kwargs={
+                "task_context_str": task_context_str,
+                "yaml_format_str": YAML_OUTPUT_FORMAT,
+            },
+        ).call()
         self.generator = Generator(
             model_client=model_client,
             model_kwargs=model_kwargs,
             output_processors=YamlParser(),
             template=LLM_AUGMENTER_TEMPLATE,
-            preset_prompt_kwargs={
-                "task_context_str": task_context_str,
-                "yaml_format_str": YAML_OUTPUT_FORMAT,
-            },
+            prompt_kwargs={"system_str": system_str.strip()},
         )
 
     # TODO: return GeneratorOutput directly
@@ -1,6 +1,6 @@
 import functools
 import warnings
-from typing import List, Optional, Dict
+from typing import Any, Callable, List, Optional, Dict, Tuple
 import logging
 
 from lightrag.core.generator import Generator
@@ -110,7 +110,7 @@ def trace_generator_call(
 ):
     r"""Decorator to trace generator predictions in a task component, especially failed ones.
 
-    This decorator is a wrapper around the generator call method. It logs the generator call by
+    This decorator is a wrapper around the generator call and acall methods. It logs the generator call by
     reading its GeneratorOutput and logs the call if the output is an error.
 
     Args:
@@ -157,32 +157,48 @@ def trace_generator_call(
         original_init = cls.__init__
         class_name = cls.__name__
 
+        def _log_output(
+            generator_name: str,
+            output: Any,
+            kwargs: Dict[str, Any],
+            error_only: bool,
+            logger: GeneratorCallLogger,
+        ):
+            try:
+                if (error_only and output.error is not None) or not error_only:
+                    log.debug(f"Logging generator call for {generator_name}")
+                    logger.log_call(
+                        name=generator_name,
+                        model_kwargs=kwargs.get("model_kwargs", {}),
+                        prompt_kwargs=kwargs.get("prompt_kwargs", {}),
+                        output=output,
+                    )
+            except Exception as e:
+                log.error(f"Error logging generator call for {generator_name}: {e}")
+
         def _wrap_generator(
             generator_name: str,
             generator: Generator,
             error_only: bool,
             logger: GeneratorCallLogger,
-        ):
-            r"""Wrap the call method of the generator to log the call."""
+        ) -> Tuple[Callable, Callable]:
+            r"""Wrap the call and acall methods of the generator to log the call."""
             original_call = generator.call
+            original_acall = generator.acall
 
             @functools.wraps(original_call)
             def wrapped_call(*args, **kwargs):
                 output = original_call(*args, **kwargs)
-                try:
-                    if (error_only and output.error is not None) or not error_only:
-                        log.debug(f"Logging generator call for {generator_name}")
-                        logger.log_call(
-                            name=generator_name,
-                            model_kwargs=kwargs.get("model_kwargs", {}),
-                            prompt_kwargs=kwargs.get("prompt_kwargs", {}),
-                            output=output,
-                        )
-                except Exception as e:
-                    log.error(f"Error logging generator call for {generator_name}: {e}")
+                _log_output(generator_name, output, kwargs, error_only, logger)
+                return output
+
+            @functools.wraps(original_acall)
+            async def wrapped_acall(*args, **kwargs):
+                output = await original_acall(*args, **kwargs)
+                _log_output(generator_name, output, kwargs, error_only, logger)
                 return output
 
-            return wrapped_call
+            return wrapped_call, wrapped_acall
 
         @functools.wraps(original_init)
         def new_init(self, *args, **kwargs):
@@ -220,18 +236,16 @@ def trace_generator_call(
                     self.generator_call_logger.register_generator(attr_name)
                     filename = self.generator_call_logger.get_log_location(attr_name)
                     log.info(f"Registered generator {attr_name} with file {filename}")
-                # Wrap the call method of the target generator
+                # Wrap the call and acall methods of the target generator
                 if target_generator and hasattr(target_generator, "call"):
-                    setattr(
-                        target_generator,
-                        "call",
-                        _wrap_generator(
-                            generator_name=attr_name,
-                            generator=target_generator,
-                            error_only=error_only,
-                            logger=self.generator_call_logger,
-                        ),
+                    wrapped_call, wrapped_acall = _wrap_generator(
+                        generator_name=attr_name,
+                        generator=target_generator,
+                        error_only=error_only,
+                        logger=self.generator_call_logger,
                     )
+                    setattr(target_generator, "call", wrapped_call)
+                    setattr(target_generator, "acall", wrapped_acall)
 
         cls.__init__ = new_init
         return cls
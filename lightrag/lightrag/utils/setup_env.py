@@ -1,3 +1,4 @@
+from typing import List, Optional
 import dotenv
 import os
 import logging
@@ -5,8 +6,14 @@ import logging
 log = logging.getLogger(__name__)
 
 
-def setup_env(dotenv_path: str = ".env"):
-    """Load environment variables from .env file."""
+def setup_env(dotenv_path: str = ".env", required_keys: Optional[List[str]] = None):
+    """Load environment variables from .env file.
+
+    It is skipped when all the ``required_keys`` are already set, e.g. in a deployed environment
+    without a .env file.
+    """
+    if required_keys and all(os.environ.get(key) for key in required_keys):
+        return
 
     if not os.path.exists(dotenv_path):
         raise FileNotFoundError(f"File not found: {dotenv_path}")
@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+from lightrag.core.types import ModelType
+
+# anthropic is an optional dependency, not in the test group
+pytest.importorskip("anthropic")
+from lightrag.components.model_client.anthropic_client import (
+    AnthropicAPIClient,
+    split_system_prompt,
+)
+
+
+class TestSplitSystemPrompt(unittest.TestCase):
+    def test_with_system_section(self):
+        system_prompt, user_prompt = split_system_prompt(
+            "<SYS>You are a helpful assistant.</SYS>\nUser: Hello"
+        )
+        self.assertEqual(system_prompt, "You are a helpful assistant.")
+        self.assertEqual(user_prompt, "User: Hello")
+
+    def test_without_system_section(self):
+        prompt = "User: Hello"
+        self.assertEqual(split_system_prompt(prompt), (None, prompt))
+
+    def test_empty_system_section(self):
+        prompt = "<SYS>  </SYS>\nUser: Hello"
+        self.assertEqual(split_system_prompt(prompt), (None, prompt))
+
+    def test_empty_user_prompt(self):
+        prompt = "<SYS>You are a helpful assistant.</SYS>\n"
+        self.assertEqual(split_system_prompt(prompt), (None, prompt))
+
+
+class TestAnthropicAPIClient(unittest.TestCase):
+    @patch.dict("os.environ", {"ANTHROPIC_API_KEY": "fake_api_key"})
+    def setUp(self):
+        self.client = AnthropicAPIClient()
+        self.model_kwargs = {"model": "claude-3-opus-20240229", "max_tokens": 1024}
+
+    def test_system_block_with_cache_control(self):
+        api_kwargs = self.client.convert_inputs_to_api_kwargs(
+            input="<SYS>You are a helpful assistant.</SYS>\nUser: Hello",
+            model_kwargs=self.model_kwargs,
+            model_type=ModelType.LLM,
+        )
+        self.assertEqual(
+            api_kwargs["system"],
+            [
+                {
+                    "type": "text",
+                    "text": "You are a helpful assistant.",
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+        )
+        self.assertEqual(
+            api_kwargs["messages"], [{"role": "user", "content": "User: Hello"}]
+        )
+        self.assertEqual(api_kwargs["model"], self.model_kwargs["model"])
+        self.assertNotIn("system", self.model_kwargs)
+
+    def test_no_system_block_without_system_section(self):
+        api_kwargs = self.client.convert_inputs_to_api_kwargs(
+            input="User: Hello",
+            model_kwargs=self.model_kwargs,
+            model_type=ModelType.LLM,
+        )
+        self.assertNotIn("system", api_kwargs)
+        self.assertEqual(
+            api_kwargs["messages"], [{"role": "user", "content": "User: Hello"}]
+        )
+
+    def test_no_system_block_with_empty_system_section(self):
+        prompt = "<SYS></SYS>\nUser: Hello"
+        api_kwargs = self.client.convert_inputs_to_api_kwargs(
+            input=prompt, model_kwargs=self.model_kwargs, model_type=ModelType.LLM
+        )
+        self.assertNotIn("system", api_kwargs)
+        self.assertEqual(api_kwargs["messages"], [{"role": "user", "content": prompt}])
+
+    def test_keep_system_from_model_kwargs(self):
+        prompt = "<SYS>You are a helpful assistant.</SYS>\nUser: Hello"
+        api_kwargs = self.client.convert_inputs_to_api_kwargs(
+            input=prompt,
+            model_kwargs={**self.model_kwargs, "system": "Be brief."},
+            model_type=ModelType.LLM,
+        )
+        self.assertEqual(api_kwargs["system"], "Be brief.")
+        self.assertEqual(api_kwargs["messages"], [{"role": "user", "content": prompt}])
+
+    def test_unsupported_model_type(self):
+        with self.assertRaises(ValueError):
+            self.client.convert_inputs_to_api_kwargs(
+                input="Hello", model_type=ModelType.EMBEDDER
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
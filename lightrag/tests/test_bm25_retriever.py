@@ -0,0 +1,42 @@
+import unittest
+
+from lightrag.components.retriever import BM25Retriever
+
+
+class TestBM25Retriever(unittest.TestCase):
+    def setUp(self):
+        self.documents = [
+            "hello world",
+            "the quick brown fox",
+            "hello there brown dog",
+            "nothing relevant here",
+        ]
+        self.retriever = BM25Retriever(
+            top_k=2, documents=self.documents, use_tokenizer=False
+        )
+
+    def test_batch_queries(self):
+        output = self.retriever(["world dog", "brown fox", "unknown"])
+        self.assertEqual(len(output), 3)
+        self.assertEqual(sorted(output[0].doc_indices), [0, 2])
+        self.assertEqual(output[1].doc_indices[0], 1)
+        # no document contains the token, the ties keep the document order
+        self.assertEqual(output[2].doc_indices, [0, 1])
+        self.assertEqual(output[2].doc_scores, [0.0, 0.0])
+
+    def test_scores_match_the_single_query(self):
+        output = self.retriever(["hello brown", "fox"])
+        for retriever_output in output:
+            scores = self.retriever._get_scores(retriever_output.query.split())
+            self.assertEqual(
+                retriever_output.doc_scores,
+                [scores[i] for i in retriever_output.doc_indices],
+            )
+
+    def test_top_k_larger_than_documents(self):
+        output = self.retriever("hello", top_k=10)
+        self.assertEqual(len(output[0].doc_indices), len(self.documents))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import Mock
+
+from lightrag.core.embedder import Embedder
+from lightrag.core.types import Document, EmbedderOutput, Embedding, RetrieverOutput
+from lightrag.components.data_process import ToEmbeddings
+from lightrag.components.data_process.data_components import (
+    chunk_texts_to_context_str,
+    retriever_output_to_context_str,
+)
+
+
+def embed(input, model_kwargs={}):
+    return EmbedderOutput(
+        data=[
+            Embedding(embedding=[float(len(text))], index=i)
+            for i, text in enumerate(input)
+        ]
+    )
+
+
+class TestToEmbeddings(unittest.TestCase):
+    def setUp(self):
+        self.embedder = Mock(spec=Embedder)
+        self.embedder.call.side_effect = embed
+
+    def test_embed_duplicated_texts_once(self):
+        documents = [Document(text="a" * (i % 3 + 1)) for i in range(9)]
+        output = ToEmbeddings(embedder=self.embedder, batch_size=2)(documents)
+
+        embedded_texts = [
+            text
+            for call in self.embedder.call.call_args_list
+            for text in call.kwargs["input"]
+        ]
+        self.assertEqual(embedded_texts, ["a", "aa", "aaa"])
+        self.assertEqual(
+            [doc.vector for doc in output], [[float(i % 3 + 1)] for i in range(9)]
+        )
+        # the input documents are not modified
+        self.assertTrue(all(not doc.vector for doc in documents))
+
+
+class TestRetrieverOutputToContextStr(unittest.TestCase):
+    def test_deduplicate_by_chunk_id(self):
+        chunks = [Document(text=text, id=text) for text in ["a", "b", "c"]]
+        outputs = [
+            RetrieverOutput(doc_indices=[0, 1], documents=[chunks[0], chunks[1]]),
+            RetrieverOutput(doc_indices=[1, 2], documents=[chunks[1], chunks[2]]),
+        ]
+        self.assertEqual(retriever_output_to_context_str(outputs), "a b b c")
+        self.assertEqual(
+            retriever_output_to_context_str(outputs, deduplicate=True), "a b c"
+        )
+
+
+class TestChunkTextsToContextStr(unittest.TestCase):
+    def test_deduplicate_by_id_not_text(self):
+        ids = ["1", "2", "1", "3"]
+        texts = ["a", "b", "a", "b"]
+        self.assertEqual(chunk_texts_to_context_str(ids, texts), "a b a b")
+        self.assertEqual(
+            chunk_texts_to_context_str(ids, texts, deduplicate=True), "a b b"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
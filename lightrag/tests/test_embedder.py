@@ -0,0 +1,52 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+from lightrag.core.embedder import Embedder, BatchEmbedder
+from lightrag.core.types import EmbedderOutput, Embedding
+
+
+def embed(input, model_kwargs={}):
+    time.sleep(0.01)
+    return EmbedderOutput(
+        data=[
+            Embedding(embedding=[float(len(text))], index=i)
+            for i, text in enumerate(input)
+        ]
+    )
+
+
+class TestBatchEmbedder(unittest.TestCase):
+    def setUp(self):
+        self.embedder = Mock(spec=Embedder)
+        self.embedder.call.side_effect = embed
+        self.input = ["a" * i for i in range(1, 11)]
+
+    def test_batches_in_order(self):
+        batch_embedder = BatchEmbedder(embedder=self.embedder, batch_size=3)
+        outputs = batch_embedder(input=self.input)
+        self.assertEqual(len(outputs), 4)
+        self.assertEqual(self.embedder.call.call_count, 4)
+        embeddings = [data.embedding[0] for output in outputs for data in output.data]
+        self.assertEqual(embeddings, [float(i) for i in range(1, 11)])
+
+    def test_concurrent_batches_in_order(self):
+        thread_ids = set()
+
+        def embed_in_thread(input, model_kwargs={}):
+            thread_ids.add(threading.get_ident())
+            return embed(input, model_kwargs)
+
+        self.embedder.call.side_effect = embed_in_thread
+        batch_embedder = BatchEmbedder(
+            embedder=self.embedder, batch_size=3, max_concurrency=4
+        )
+        outputs = batch_embedder(input=self.input)
+        embeddings = [data.embedding[0] for output in outputs for data in output.data]
+        self.assertEqual(embeddings, [float(i) for i in range(1, 11)])
+        self.assertGreater(len(thread_ids), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
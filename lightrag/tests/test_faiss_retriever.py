@@ -1,6 +1,9 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import Mock
 import numpy as np
+import faiss
 
 from lightrag.components.retriever import FAISSRetriever
 from lightrag.core.embedder import Embedder
@@ -116,6 +119,161 @@ class TestFAISSRetriever(unittest.TestCase):
         self.assertEqual(len(result[0].doc_indices), retriever.top_k)
         self.assertEqual(len(result[0].doc_scores), retriever.top_k)
 
+    def test_build_index_from_index_factory(self):
+        retriever = FAISSRetriever(
+            embedder=self.embedder,
+            dimensions=self.dimensions,
+            index_factory="IVF4,Flat",
+            nprobe=4,
+            min_train_size=100,
+        )
+        embeddings = create_dummy_embeddings(200, self.dimensions)
+        retriever.build_index_from_documents(embeddings)
+        self.assertIsInstance(retriever.index, faiss.IndexIVFFlat)
+        self.assertEqual(retriever.index.nprobe, 4)
+        self.assertEqual(retriever.total_documents, 200)
+
+        # nprobe equals nlist, so the search is exhaustive
+        result = retriever.retrieve_embedding_queries(embeddings[:1])
+        self.assertEqual(result[0].doc_indices[0], 0)
+
+    def test_index_factory_falls_back_to_flat_index(self):
+        retriever = FAISSRetriever(
+            embedder=self.embedder,
+            dimensions=self.dimensions,
+            index_factory="IVF4,Flat",
+        )
+        retriever.build_index_from_documents(self.embeddings)
+        self.assertIsInstance(retriever.index, faiss.IndexFlatIP)
+
+    def test_build_hnsw_index_without_training(self):
+        retriever = FAISSRetriever(
+            embedder=self.embedder,
+            dimensions=self.dimensions,
+            index_factory="HNSW32,Flat",
+            ef_search=64,
+            ef_construction=200,
+        )
+        # below min_train_size, but HNSW does not need training
+        retriever.build_index_from_documents(self.embeddings)
+        self.assertIsInstance(retriever.index, faiss.IndexHNSWFlat)
+        self.assertEqual(retriever.index.hnsw.efSearch, 64)
+        self.assertEqual(retriever.index.hnsw.efConstruction, 200)
+        result = retriever.retrieve_embedding_queries(self.embeddings[:1])
+        self.assertEqual(result[0].doc_indices[0], 0)
+
+    def test_query_embedding_cache(self):
+        retriever = FAISSRetriever(
+            embedder=self.embedder, dimensions=self.dimensions, query_cache_size=2
+        )
+        retriever.build_index_from_documents(self.embeddings)
+        first = retriever.retrieve_string_queries(self.single_query)
+        second = retriever.retrieve_string_queries(self.single_query)
+        self.assertEqual(self.embedder.call_count, 1)
+        self.assertEqual(first[0].doc_indices, second[0].doc_indices)
+        self.assertEqual(first[0].doc_scores, second[0].doc_scores)
+
+    def test_use_gpu_falls_back_to_cpu_index(self):
+        retriever = FAISSRetriever(
+            embedder=self.embedder, dimensions=self.dimensions, use_gpu=True
+        )
+        # a list of float64 arrays is converted to a contiguous float32 array
+        embeddings = np.array(self.embeddings, dtype=np.float64)
+        retriever.build_index_from_documents(list(embeddings))
+        self.assertEqual(retriever.index.ntotal, self.num_embeddings)
+        query_embedding = np.asfortranarray(embeddings[:2])
+        result = retriever.retrieve_embedding_queries(query_embedding)
+        self.assertEqual([output.doc_indices[0] for output in result], [0, 1])
+
+    def test_flat_index_vector_dtype(self):
+        for vector_dtype, code_size in [("fp32", None), ("fp16", 2), ("int8", 1)]:
+            retriever = FAISSRetriever(
+                embedder=self.embedder,
+                dimensions=self.dimensions,
+                vector_dtype=vector_dtype,
+            )
+            retriever.build_index_from_documents(self.embeddings)
+            if code_size is None:
+                self.assertIsInstance(retriever.index, faiss.IndexFlatIP)
+            else:
+                self.assertIsInstance(retriever.index, faiss.IndexScalarQuantizer)
+                self.assertEqual(retriever.index.code_size, code_size * self.dimensions)
+            result = retriever.retrieve_embedding_queries(self.embeddings[:1])
+            self.assertEqual(result[0].doc_indices[0], 0)
+
+        with self.assertRaises(ValueError):
+            FAISSRetriever(embedder=self.embedder, vector_dtype="fp8")
+
+    def test_save_and_load_trained_index(self):
+        settings = {
+            "dimensions": self.dimensions,
+            "index_factory": "OPQ4_16,IVF4_HNSW8,PQ4x4",
+            "nprobe": 2,
+            "ef_search": 16,
+            "min_train_size": 100,
+        }
+        retriever = FAISSRetriever(embedder=self.embedder, **settings)
+        embeddings = create_dummy_embeddings(300, self.dimensions)
+        retriever.build_index_from_documents(embeddings)
+        ivf = faiss.extract_index_ivf(retriever.index)
+        self.assertEqual(ivf.nprobe, 2)
+        self.assertEqual(faiss.downcast_index(ivf.quantizer).hnsw.efSearch, 16)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "index.faiss")
+            retriever.save_to_file(path)
+            loaded = FAISSRetriever.load_from_file(
+                path, embedder=self.embedder, **settings
+            )
+        self.assertTrue(loaded.indexed)
+        self.assertEqual(loaded.total_documents, 300)
+        ivf = faiss.extract_index_ivf(loaded.index)
+        self.assertEqual(ivf.nprobe, 2)
+        self.assertEqual(faiss.downcast_index(ivf.quantizer).hnsw.efSearch, 16)
+
+        query_embedding = embeddings[:1]
+        self.assertEqual(
+            loaded.retrieve_embedding_queries(query_embedding)[0].doc_indices,
+            retriever.retrieve_embedding_queries(query_embedding)[0].doc_indices,
+        )
+
+    def test_load_mmap_index(self):
+        settings = {
+            "dimensions": self.dimensions,
+            "index_factory": "IVF4,Flat",
+            "nprobe": 4,
+            "min_train_size": 100,
+        }
+        retriever = FAISSRetriever(embedder=self.embedder, **settings)
+        embeddings = create_dummy_embeddings(200, self.dimensions)
+        retriever.build_index_from_documents(embeddings)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "index.faiss")
+            retriever.save_to_file(path)
+            loaded = FAISSRetriever.load_from_file(
+                path, embedder=self.embedder, mmap=True, **settings
+            )
+            self.assertEqual(loaded.total_documents, 200)
+            self.assertEqual(loaded.index.nprobe, 4)
+            # saving again replaces the file without breaking the mapped index
+            retriever.save_to_file(path)
+            self.assertEqual(
+                loaded.retrieve_embedding_queries(embeddings[:1])[0].doc_indices,
+                retriever.retrieve_embedding_queries(embeddings[:1])[0].doc_indices,
+            )
+            with self.assertRaises(RuntimeError):  # the mapped lists are read-only
+                loaded.index.add(np.array(embeddings[:1], dtype=np.float32))
+            del loaded
+
+            # reloading the built index releases the in-memory embeddings
+            retriever.mmap = True
+            retriever.load_index(path)
+            self.assertIsNone(retriever.xb)
+            self.assertIsNone(retriever.documents)
+            self.assertEqual(retriever.total_documents, 200)
+            del retriever
+
 
 if __name__ == "__main__":
     unittest.main()
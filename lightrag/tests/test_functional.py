@@ -0,0 +1,30 @@
+import unittest
+
+import numpy as np
+
+from lightrag.core.functional import get_top_k_indices_scores
+
+
+class TestGetTopKIndicesScores(unittest.TestCase):
+    def test_top_k_in_descending_order(self):
+        scores = [0.1, 0.9, 0.3, 0.7, 0.5]
+        indices, top_scores = get_top_k_indices_scores(scores, 3)
+        self.assertEqual(indices, [1, 3, 4])
+        self.assertEqual(top_scores, [0.9, 0.7, 0.5])
+
+    def test_same_as_full_sort(self):
+        scores = np.random.rand(1000).astype(np.float32)
+        indices, top_scores = get_top_k_indices_scores(scores, 10)
+        expected = np.argsort(scores)[::-1][:10]
+        self.assertEqual(indices, expected.tolist())
+        self.assertEqual(top_scores, scores[expected].tolist())
+
+    def test_top_k_larger_than_scores(self):
+        indices, top_scores = get_top_k_indices_scores([0.2, 0.8], 5)
+        self.assertEqual(indices, [1, 0])
+        self.assertEqual(top_scores, [0.8, 0.2])
+        self.assertEqual(get_top_k_indices_scores([0.2, 0.8], 0), ([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
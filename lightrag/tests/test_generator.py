@@ -5,9 +5,10 @@ import shutil
 
 from lightrag.core.types import GeneratorOutput
 from lightrag.core.generator import Generator
+from lightrag.core.component import fun_to_component
 
 
-from lightrag.core.model_client import ModelClient
+from lightrag.core.model_client import ModelClient, ResponseCache
 from lightrag.tracing import GeneratorStateLogger
 
 
@@ -49,6 +50,77 @@ class TestGenerator(IsolatedAsyncioTestCase):
         self.assertIsInstance(output, GeneratorOutput)
         # self.assertEqual(output.data, "Generated text response")
 
+    def test_generator_call_with_cache(self):
+        self.mock_api_client.convert_inputs_to_api_kwargs.side_effect = (
+            lambda input, model_kwargs, model_type: {**model_kwargs, "input": input}
+        )
+        generator = Generator(model_client=self.mock_api_client, use_cache=True)
+        prompt_kwargs = {"input_str": "Hello, world!"}
+        output = generator.call(prompt_kwargs=prompt_kwargs)
+        cached_output = generator.call(prompt_kwargs=prompt_kwargs)
+        self.assertIs(output, cached_output)
+        self.mock_api_client.call.assert_called_once()
+        self.assertEqual(generator._response_cache.cache_read, 1)
+        self.assertEqual(generator._response_cache.cache_write, 1)
+
+        # different prompt is a cache miss
+        generator.call(prompt_kwargs={"input_str": "Hello, again!"})
+        self.assertEqual(self.mock_api_client.call.call_count, 2)
+
+    def test_response_cache_eviction_and_ttl(self):
+        cache = ResponseCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" becomes the least recently used
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(len(cache), 2)
+
+        cache.set("d", 4, ttl=-1)
+        self.assertIsNone(cache.get("d"))
+
+        key1 = ResponseCache.hash_key({"model": "gpt-3.5-turbo", "temperature": 0})
+        key2 = ResponseCache.hash_key({"temperature": 0, "model": "gpt-3.5-turbo"})
+        self.assertEqual(key1, key2)
+
+    async def test_generator_acall_with_trained_params(self):
+        async def acall(api_kwargs, model_type):
+            return "Generated text response"
+
+        self.mock_api_client.acall.side_effect = acall
+        generator = Generator(
+            model_client=self.mock_api_client,
+            template="{{examples_str}} {{input_str}}",
+            prompt_kwargs={"examples_str": "1 + 1 = 2"},
+            trainable_params=["examples_str"],
+        )
+        generator.train()
+        prompt_kwargs = {"input_str": "2 + 2 = ?"}
+        output = await generator.acall(prompt_kwargs=prompt_kwargs)
+        self.assertEqual(output.data, "Generated text response")
+        _, kwargs = self.mock_api_client.convert_inputs_to_api_kwargs.call_args
+        self.assertEqual(kwargs["input"], "1 + 1 = 2 2 + 2 = ?")
+        # the caller's prompt_kwargs is not modified
+        self.assertEqual(prompt_kwargs, {"input_str": "2 + 2 = ?"})
+
+    def test_generator_stream_with_output_processors(self):
+        @fun_to_component
+        def to_upper(x: str) -> str:
+            return x.upper()
+
+        self.mock_api_client.parse_chat_completion.side_effect = lambda completion: (
+            chunk for chunk in ["Generated ", None, "text"]
+        )
+        generator = Generator(
+            model_client=self.mock_api_client, output_processors=to_upper
+        )
+        output = generator.call(
+            prompt_kwargs={"input_str": "Hello, world!"}, model_kwargs={"stream": True}
+        )
+        self.assertEqual(output.raw_response, "Generated text")
+        self.assertEqual(output.data, "GENERATED TEXT")
+
     def test_generator_prompt_logger_first_record(self):
         # prompt_kwargs = {"input_str": "Hello, world!"}
         # model_kwargs = {"model": "gpt-3.5-turbo"}
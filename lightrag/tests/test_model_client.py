@@ -35,6 +35,40 @@ class TestLazyImportSubclassing(unittest.TestCase):
 
         CorrectCustomizeOpenAIClient()
 
+    @patch.dict("os.environ", {"OPENAI_API_KEY": "test_api_key"})
+    def test_sync_clients_share_http_client(self):
+        from lightrag.components.model_client.openai_client import OpenAIClient
+
+        client1, client2 = OpenAIClient(), OpenAIClient()
+        self.assertIs(client1.sync_client._client, client2.sync_client._client)
+
+    @patch.dict("os.environ", {"OPENAI_API_KEY": "test_api_key"})
+    def test_sync_client_cached_by_api_key(self):
+        from lightrag.components.model_client.openai_client import OpenAIClient
+
+        client1, client2 = OpenAIClient(), OpenAIClient()
+        self.assertIs(client1.sync_client, client2.sync_client)
+        client3 = OpenAIClient(api_key="another_api_key")
+        self.assertIsNot(client1.sync_client, client3.sync_client)
+
+    @patch.dict("os.environ", {"OPENAI_API_KEY": "test_api_key"})
+    def test_sync_client_cached_by_base_url(self):
+        from lightrag.components.model_client.openai_client import OpenAIClient
+
+        client1 = OpenAIClient()
+        client2 = OpenAIClient(base_url="http://localhost:8000/v1")
+        self.assertIsNot(client1.sync_client, client2.sync_client)
+        self.assertEqual(str(client2.sync_client.base_url), "http://localhost:8000/v1/")
+        client3 = OpenAIClient(base_url="http://localhost:8000/v1")
+        self.assertIs(client2.sync_client, client3.sync_client)
+
+    @patch.dict("os.environ", {}, clear=True)
+    def test_missing_api_key_raises(self):
+        from lightrag.components.model_client.openai_client import OpenAIClient
+
+        with self.assertRaises(ValueError):
+            OpenAIClient()
+
 
 if __name__ == "__main__":
     unittest.main()
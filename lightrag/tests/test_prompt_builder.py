@@ -0,0 +1,31 @@
+import unittest
+
+from lightrag.core.prompt_builder import Prompt, compile_jinja2_template
+
+
+class TestPrompt(unittest.TestCase):
+    def test_prompt_variables_and_call(self):
+        prompt = Prompt(template="Hello, {{ name }}! {{ count }}")
+        self.assertEqual(set(prompt.get_prompt_variables()), {"name", "count"})
+        self.assertEqual(prompt.call(name="world", count=1), "Hello, world! 1")
+        self.assertEqual(prompt.call(name="world", count=True), "Hello, world! True")
+        self.assertEqual(prompt.call(name="world", count=1.0), "Hello, world! 1.0")
+
+    def test_template_is_compiled_once(self):
+        template = "{{ input_str }}"
+        prompt1, prompt2 = Prompt(template=template), Prompt(template=template)
+        self.assertIs(prompt1.jinja2_template, prompt2.jinja2_template)
+        self.assertIs(prompt1.jinja2_template, compile_jinja2_template(template))
+
+    def test_non_primitive_kwargs(self):
+        prompt = Prompt(template="{% for x in items %}{{ x }},{% endfor %}")
+        self.assertEqual(prompt.call(items=[1, 2]), "1,2,")
+        self.assertEqual(prompt.call(items=[3]), "3,")
+
+    def test_invalid_template(self):
+        with self.assertRaises(ValueError):
+            Prompt(template="{% if %}")
+
+
+if __name__ == "__main__":
+    unittest.main()
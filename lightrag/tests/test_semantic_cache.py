@@ -0,0 +1,77 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+
+from lightrag.core.embedder import Embedder
+from lightrag.core.semantic_cache import SemanticCache
+from lightrag.core.types import EmbedderOutput, Embedding
+
+EMBEDDINGS = {
+    "What is the capital of France?": [1.0, 0.0, 0.0],
+    "what's the capital city of France": [0.99, 0.05, 0.0],
+    "How tall is Mount Everest?": [0.0, 1.0, 0.0],
+}
+
+
+def embed(input, model_kwargs={}):
+    return EmbedderOutput(data=[Embedding(embedding=EMBEDDINGS[input], index=0)])
+
+
+class TestSemanticCache(unittest.TestCase):
+    def setUp(self):
+        self.embedder = Mock(spec=Embedder, side_effect=embed)
+        self.cache = SemanticCache(embedder=self.embedder, threshold=0.95)
+
+    def test_hit_on_paraphrased_query(self):
+        embedding = self.cache.embed("What is the capital of France?")
+        self.assertIsNone(self.cache.get(embedding))
+        self.cache.set(embedding, "Paris")
+
+        embedding = self.cache.embed("what's the capital city of France")
+        self.assertEqual(self.cache.get(embedding), "Paris")
+        self.assertEqual(self.cache.cache_read, 1)
+
+        embedding = self.cache.embed("How tall is Mount Everest?")
+        self.assertIsNone(self.cache.get(embedding))
+
+    def test_replace_oldest_when_full(self):
+        cache = SemanticCache(embedder=self.embedder, threshold=0.95, max_size=1)
+        cache.set(cache.embed("What is the capital of France?"), "Paris")
+        cache.set(cache.embed("How tall is Mount Everest?"), "8849m")
+        self.assertEqual(len(cache), 1)
+        self.assertIsNone(cache.get(cache.embed("What is the capital of France?")))
+        self.assertEqual(cache.get(cache.embed("How tall is Mount Everest?")), "8849m")
+
+    def test_embedder_error_is_a_miss(self):
+        self.embedder.side_effect = lambda input, model_kwargs={}: EmbedderOutput(
+            error="API error"
+        )
+        embedding = self.cache.embed("What is the capital of France?")
+        self.assertIsNone(embedding)
+        self.cache.set(embedding, "Paris")
+        self.assertEqual(len(self.cache), 0)
+
+    def test_aembed_batch(self):
+        queries = list(EMBEDDINGS)
+        self.embedder.acall = AsyncMock(
+            return_value=EmbedderOutput(
+                data=[
+                    Embedding(embedding=EMBEDDINGS[query], index=i)
+                    for i, query in enumerate(queries)
+                ]
+            )
+        )
+        embeddings = asyncio.run(self.cache.aembed_batch(queries))
+        self.embedder.acall.assert_called_once_with(input=queries)
+        for query, embedding in zip(queries, embeddings):
+            self.assertTrue(np.allclose(embedding, self.cache.embed(query)))
+
+        self.embedder.acall = AsyncMock(return_value=EmbedderOutput(error="API error"))
+        embeddings = asyncio.run(self.cache.aembed_batch(queries))
+        self.assertEqual(embeddings, [None] * len(queries))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from lightrag.utils import setup_env
+
+
+class TestSetupEnv(unittest.TestCase):
+    @patch.dict("os.environ", {}, clear=True)
+    def test_load_dotenv(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dotenv_path = os.path.join(tmp_dir, ".env")
+            with open(dotenv_path, "w") as file:
+                file.write("OPENAI_API_KEY=from_dotenv\n")
+            setup_env(dotenv_path=dotenv_path, required_keys=["OPENAI_API_KEY"])
+        self.assertEqual(os.environ["OPENAI_API_KEY"], "from_dotenv")
+
+    @patch.dict("os.environ", {}, clear=True)
+    def test_missing_dotenv_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            setup_env(dotenv_path="missing.env", required_keys=["OPENAI_API_KEY"])
+
+    @patch.dict("os.environ", {"OPENAI_API_KEY": "test_api_key"}, clear=True)
+    def test_skip_when_required_keys_are_set(self):
+        setup_env(dotenv_path="missing.env", required_keys=["OPENAI_API_KEY"])
+        self.assertEqual(os.environ["OPENAI_API_KEY"], "test_api_key")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -59,6 +59,22 @@ class TestTextSplitter(unittest.TestCase):
         result_texts = [doc.text for doc in result]
         self.assertEqual(result_texts, expected_texts)
 
+    def test_split_text_cache(self):
+        text = "This is a simple test to check splitting."
+        first = self.splitter.split_text(text)
+        second = self.splitter.split_text(text)
+        self.assertEqual(first, second)
+        self.assertEqual(self.splitter._split_cache.cache_read, 1)
+        # the cache keeps a copy, changing the returned chunks does not affect it
+        first.append("extra")
+        self.assertEqual(self.splitter.split_text(text), second)
+
+        splitter = TextSplitter(
+            split_by="word", chunk_size=5, chunk_overlap=2, cache_size=0
+        )
+        self.assertIsNone(splitter._split_cache)
+        self.assertEqual(splitter.split_text(text), second)
+
     def test_empty_text_handling(self):
         # Test handling of empty text
         with self.assertRaises(ValueError):
@@ -0,0 +1,68 @@
+import tempfile
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, Mock, patch
+
+from lightrag.core.component import Component
+from lightrag.core.generator import Generator
+from lightrag.core.model_client import ModelClient
+from lightrag.tracing import trace_generator_call
+
+
+def create_task_class(save_dir: str):
+    @trace_generator_call(save_dir=save_dir, error_only=True)
+    class Task(Component):
+        def __init__(self, model_client: ModelClient):
+            super().__init__()
+            self.generator = Generator(model_client=model_client)
+            # a second generator sharing the client, such as one with a pre-rendered system prompt
+            self.frozen_generator = Generator(
+                model_client=model_client,
+                template="{{system_str}} {{input_str}}",
+                prompt_kwargs={"system_str": "<SYS>You are a classifier.</SYS>"},
+            )
+
+    return Task
+
+
+class TestTraceGeneratorCall(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.model_client = Mock(ModelClient)
+        self.model_client.convert_inputs_to_api_kwargs.return_value = {}
+        self.task = create_task_class(self.tmp_dir.name)(self.model_client)
+
+    def test_log_failed_call(self):
+        self.model_client.call.side_effect = ValueError("model error")
+        with patch.object(self.task.generator_call_logger, "log_call") as log_call:
+            output = self.task.generator.call(prompt_kwargs={"input_str": "hi"})
+        self.assertIsNotNone(output.error)
+        log_call.assert_called_once()
+        self.assertEqual(log_call.call_args.kwargs["name"], "generator")
+        self.assertEqual(
+            log_call.call_args.kwargs["prompt_kwargs"], {"input_str": "hi"}
+        )
+
+    async def test_log_failed_acall(self):
+        self.model_client.acall = AsyncMock(side_effect=ValueError("model error"))
+        with patch.object(self.task.generator_call_logger, "log_call") as log_call:
+            output = await self.task.generator.acall(prompt_kwargs={"input_str": "hi"})
+        self.assertIsNotNone(output.error)
+        log_call.assert_called_once()
+        self.assertIs(log_call.call_args.kwargs["output"], output)
+
+    async def test_skip_successful_acall(self):
+        self.model_client.acall = AsyncMock(return_value="response")
+        self.model_client.parse_chat_completion.return_value = "response"
+        with patch.object(self.task.generator_call_logger, "log_call") as log_call:
+            output = await self.task.generator.acall(prompt_kwargs={"input_str": "hi"})
+        self.assertIsNone(output.error)
+        log_call.assert_not_called()
+
+    def test_log_failed_call_of_every_generator(self):
+        self.model_client.call.side_effect = ValueError("model error")
+        with patch.object(self.task.generator_call_logger, "log_call") as log_call:
+            output = self.task.frozen_generator.call(prompt_kwargs={"input_str": "hi"})
+        self.assertIsNotNone(output.error)
+        log_call.assert_called_once()
+        self.assertEqual(log_call.call_args.kwargs["name"], "frozen_generator")
@@ -1,3 +1,3 @@
 from lightrag.utils import setup_env
 
-setup_env()
+setup_env(required_keys=["OPENAI_API_KEY"])
@@ -1,9 +1,11 @@
 # https://huggingface.co/datasets/trec
 # labels: https://huggingface.co/datasets/trec/blob/main/trec.py
-from typing import Sequence, Dict
+from typing import Sequence, Dict, Any
 import re
 import os
 
+import numpy as np
+
 from torch.utils.data import Dataset, DataLoader, WeightedRandomSampler
 import torch
 
@@ -94,19 +96,33 @@ class TrecDataset(Dataset):
         return data
 
 
+_CLASS_LABEL_RE = re.compile(r"\d+")
+
+
 def extract_class_label(text: str) -> int:
-    re_pattern = r"\d+"
+    r"""Get the first integer in the text as the class label, -1 if there is none."""
     if isinstance(text, str):
-        label_match = re.findall(re_pattern, text)
-        if label_match:
-            label = int(label_match[0])
-        else:
-            label = -1
-        return label
+        label_match = _CLASS_LABEL_RE.search(text)
+        return int(label_match.group()) if label_match else -1
     else:
         return text
 
 
+def extract_class_labels(texts: Sequence[Any]) -> np.ndarray:
+    r"""Batch version of ``extract_class_label``, returns the labels as an int array.
+
+    The int labels are converted in one ``np.asarray``, only the ``str`` outputs are parsed.
+    """
+    try:  # the predictions of TRECClassifier are already ints
+        return np.asarray(texts, dtype=np.int64)
+    except (TypeError, ValueError):
+        pass
+    labels = np.asarray(texts, dtype=object)
+    is_str = np.array([isinstance(label, str) for label in labels], dtype=bool)
+    labels[is_str] = [extract_class_label(text) for text in labels[is_str]]
+    return labels.astype(np.int64)
+
+
 def calculate_class_weights(labels: torch.Tensor) -> torch.Tensor:
     # Count frequencies of each class
     class_counts = torch.bincount(labels)
@@ -134,7 +150,7 @@ def sample_subset_dataset(
 
 # make sure to run this only once to prepare a small set of train, eval, and test datasets and keep it fixed during different experiments.
 def prepare_datasets(path: str = None):
-    path = os.path.join(get_script_dir(), "data") or path
+    path = path or os.path.join(get_script_dir(), "data")
     dataset = load_dataset("trec")
     print(f"train: {len(dataset['train'])}, test: {len(dataset['test'])}")  # 5452, 500
     print(f"train example: {dataset['train'][0]}")
@@ -208,8 +224,10 @@ def prepare_datasets(path: str = None):
         f"{path}/train"
     )  # TODO: update the dataset info to the new dataset
 
+    # save in arrow format so that the splits are memory-mapped on loading instead of unpickled
+    eval_dataset_split.save_to_disk(f"{path}/eval")
+    test_dataset_split.save_to_disk(f"{path}/test")
     # use json to save for better readability
-    # along with pickle for easy loading
     save(
         eval_dataset_split,
         f"{path}/eval",
@@ -220,11 +238,18 @@ def prepare_datasets(path: str = None):
     )
 
 
+def _load_split(path: str) -> HFDataset:
+    if os.path.isdir(path):
+        return load_from_disk(dataset_path=path)
+    # the splits prepared before they were saved in arrow format
+    return load(path)[1]
+
+
 def load_datasets(path: str = None):
-    path = os.path.join(get_script_dir(), "data") or path
-    train_dataset: HFDataset = load_from_disk(dataset_path=f"{path}/train")
-    eval_dataset = load(f"{path}/eval")[1]
-    test_dataset = load(f"{path}/test")[1]
+    path = path or os.path.join(get_script_dir(), "data")
+    train_dataset = _load_split(f"{path}/train")
+    eval_dataset = _load_split(f"{path}/eval")
+    test_dataset = _load_split(f"{path}/test")
     print(f"train: {len(train_dataset)}")
     print(f"eval: {len(eval_dataset)}")
     print(f"test: {len(test_dataset)}")
@@ -1,16 +1,17 @@
-from typing import Dict, Any
-from dataclasses import field
+from typing import Dict, Any, Optional, Tuple, Type
+from dataclasses import dataclass, field
+from functools import lru_cache
 import os
 
-import re
 
-
-from lightrag.core.component import Component, Sequential, fun_to_component
+from lightrag.core.component import Component, fun_to_component
+from lightrag.core.container import Sequential
 from lightrag.core.generator import Generator
 from lightrag.components.model_client import (
     GroqAPIClient,
 )
-from lightrag.core.prompt_builder import Prompt
+from lightrag.core.prompt_builder import Prompt, render_jinja2_template
+from lightrag.core.semantic_cache import SemanticCache
 from lightrag.components.output_parsers import YamlOutputParser
 
 from lightrag.tracing import trace_generator_states, trace_generator_call
@@ -18,6 +19,7 @@ from lightrag.tracing import trace_generator_states, trace_generator_call
 from use_cases.classification.data import (
     _COARSE_LABELS,
     _COARSE_LABELS_DESC,
+    extract_class_label,
 )
 
 
@@ -34,7 +36,9 @@ Format: class_index. class_name, class_description
 - Do not try to answer the question:
 """
 
-TEMPLATE = r"""{# task desc #}
+# the static section is wrapped in <SYS></SYS> to be cached by the providers
+SYSTEM_TEMPLATE = r"""<SYS>
+{# task desc #}
 {% if task_desc_str %}
 {{task_desc_str}}
 {% endif %}
@@ -51,12 +55,20 @@ TEMPLATE = r"""{# task desc #}
 {#{% endfor %}#}
 </EXAMPLES>
 {% endif %}
-{{input_label}}: {{input}} {# input_label is the prompt argument #}
+</SYS>
+"""
+
+USER_TEMPLATE = r"""{{input_label}}: {{input}} {# input_label is the prompt argument #}
 Your output: {# the output label #}
 """
 
+TEMPLATE = SYSTEM_TEMPLATE + USER_TEMPLATE
+
+# used after freeze_examples, the system section is rendered once and passed as is
+FROZEN_TEMPLATE = r"""{{system_str}}""" + USER_TEMPLATE
 
-# @dataclass
+
+@dataclass
 class InputFormat(DataClass):
     # add the "prompt_arg" to represent the prompt argument that it should get matched to
     question: str = field(metadata={"desc": "The question to classify"})
@@ -69,7 +81,7 @@ class InputFormat(DataClass):
         return super().from_dict(data)
 
 
-# @dataclass
+@dataclass
 class OutputFormat(DataClass):
     thought: str = field(
         metadata={
@@ -114,60 +126,65 @@ anthropic_model_kwargs = {
 }  # noqa: F841
 
 
+groq_model_kwargs = {
+    "model": "gemma-7b-it",  # "llama3-8b-8192",  # "llama3-8b-8192",  # "llama3-8b-8192", #gemma-7b-it not good at following yaml format
+    "temperature": 0.0,
+    "top_p": 1,
+    "frequency_penalty": 0,
+    "presence_penalty": 0,
+    "n": 1,
+}
+
+
+# the task description and output format are the same across instances, only render them once
+@lru_cache(maxsize=None)
+def get_task_desc_str(labels: Tuple[str, ...], labels_desc: Tuple[str, ...]) -> str:
+    classes = [
+        {"label": label, "desc": desc} for label, desc in zip(labels, labels_desc)
+    ]
+    return Prompt(
+        template=CLASSIFICATION_TASK_DESC, prompt_kwargs={"classes": classes}
+    ).call()
+
+
+@lru_cache(maxsize=None)
+def get_yaml_parser(data_class: Type[DataClass]) -> YamlOutputParser:
+    r"""The parser is a function of the data class and is stateless on call, share it across instances."""
+    return YamlOutputParser(data_class=data_class)
+
+
+@lru_cache(maxsize=None)
+def get_output_format_str() -> str:
+    return get_yaml_parser(OutputFormat).format_instructions()
+
+
 @trace_generator_states(save_dir=get_tracing_path())
 @trace_generator_call(save_dir=get_tracing_path(), error_only=True)
 class TRECClassifier(Component):
     r"""
     Optimizing goal is the examples_str in the prompt
+
+    The optional ``semantic_cache`` returns the label of a near-duplicate question, it is only used
+    in eval mode as the prompt changes in training mode.
     """
 
     def __init__(
-        self, labels: list = _COARSE_LABELS, labels_desc: list = _COARSE_LABELS_DESC
+        self,
+        labels: list = _COARSE_LABELS,
+        labels_desc: list = _COARSE_LABELS_DESC,
+        semantic_cache: Optional[SemanticCache] = None,
     ):
         super().__init__()
+        self.semantic_cache = semantic_cache
         self.labels = labels
         self.num_classes = len(labels)
         self.labels_desc = labels_desc
-        labels_desc = [
-            {"label": label, "desc": desc} for label, desc in zip(labels, labels_desc)
-        ]
-        # custome prompt with variable, use Prompt to generate it
         # the varaibles in the prompts become the model parameters to optimize
-        # component and variables
+        self.task_desc_str = get_task_desc_str(tuple(labels), tuple(labels_desc))
 
-        self.task_desc_prompt = Prompt(
-            template=CLASSIFICATION_TASK_DESC,
-            preset_prompt_kwargs={"classes": labels_desc},
-        )
-        self.task_desc_str = self.task_desc_prompt()
-
-        # self.parameters = [
-        #     {
-        #         "component": Generator,
-        #         "args": {
-        #             "model_client": GroqAPIClient,
-        #             "model_kwargs": {"model": "llama3-8b-8192", "temperature": 0.0},
-        #             "preset_prompt_kwargs": {
-        #                 "task_desc_str": self.task_desc_str,
-        #                 # "output_format_str": OUTPUT_FORMAT_STR,
-        #             },
-        #         },
-        #     }
-        # ]
-        yaml_parser = YamlOutputParser(
-            data_class=OutputFormat,  # example=output_example
-        )
-        # output_str = OutputFormat.to_json_signature()
-        output_str = yaml_parser.format_instructions()
+        yaml_parser = get_yaml_parser(OutputFormat)
+        output_str = get_output_format_str()
         log.debug(f"output_str: {output_str}")
-        groq_model_kwargs = {
-            "model": "gemma-7b-it",  # "llama3-8b-8192",  # "llama3-8b-8192",  # "llama3-8b-8192", #gemma-7b-it not good at following yaml format
-            "temperature": 0.0,
-            "top_p": 1,
-            "frequency_penalty": 0,
-            "presence_penalty": 0,
-            "n": 1,
-        }
 
         @fun_to_component
         def format_class_label(x: Dict[str, Any]) -> int:
@@ -180,7 +197,7 @@ class TRECClassifier(Component):
             model_client=GroqAPIClient(),
             model_kwargs=groq_model_kwargs,
             template=TEMPLATE,
-            preset_prompt_kwargs={
+            prompt_kwargs={
                 "task_desc_str": self.task_desc_str,
                 "output_format_str": output_str,
                 "input_label": "Question",
@@ -188,13 +205,49 @@ class TRECClassifier(Component):
             trainable_params=["examples_str", "task_desc_str"],
             output_processors=Sequential(yaml_parser, format_class_label),
         )
+        # used after freeze_examples, created here so the tracing decorators wrap it too
+        self.frozen_generator = Generator(
+            model_client=self.generator.model_client,
+            model_kwargs=groq_model_kwargs,
+            template=FROZEN_TEMPLATE,
+            prompt_kwargs={"input_label": "Question"},
+            output_processors=self.generator.output_processors,
+        )
+        self._examples_frozen = False
+
+    def freeze_examples(self):
+        r"""Render the system section with the current task description and examples once.
+
+        Until ``unfreeze_examples``, the calls go to ``frozen_generator`` and only render the question,
+        and the system section stays the same prefix for the providers' prompt caching. Freeze again
+        after the parameters are updated.
+        """
+        prompt_kwargs = self.generator.prompt.compose_prompt_kwargs(
+            **self.generator._compose_prompt_kwargs({})
+        )
+        system_str = render_jinja2_template(
+            SYSTEM_TEMPLATE,
+            task_desc_str=prompt_kwargs["task_desc_str"],
+            output_format_str=prompt_kwargs["output_format_str"],
+            examples_str=prompt_kwargs["examples_str"],
+        )
+        self.frozen_generator.prompt.update_prompt_kwargs(
+            system_str=system_str, input_label=prompt_kwargs["input_label"]
+        )
+        self._examples_frozen = True
+
+    def unfreeze_examples(self):
+        self._examples_frozen = False
+
+    def _get_generator(self) -> Generator:
+        if self._examples_frozen:
+            return self.frozen_generator
+        return self.generator
 
     # def init_parameters(self):
     #     self.generator.examples_str.update_value()
 
-    def call(self, query: str) -> str:
-        re_pattern = r"\d+"
-        output = self.generator.call(prompt_kwargs={"input": query})
+    def _process_output(self, query: str, output) -> int:
         if output.data is not None and output.error is None:
             response = output.data
             return response
@@ -207,15 +260,41 @@ class TRECClassifier(Component):
             # Additional processing in case it is not predicting a number but a string
             label = output.raw_response
             if isinstance(label, str):
-                label_match = re.findall(re_pattern, label)
-                if label_match:
-                    label = int(label_match[0])
-                else:
-                    label = -1
-                return label
+                return extract_class_label(label)
             else:
                 return -1
 
+    def _use_semantic_cache(self) -> bool:
+        return self.semantic_cache is not None and not self.training
+
+    def _set_semantic_cache(self, embedding, label: int):
+        if label != -1:
+            self.semantic_cache.set(embedding, label)
+
+    def call(self, query: str) -> int:
+        if not self._use_semantic_cache():
+            output = self._get_generator().call(prompt_kwargs={"input": query})
+            return self._process_output(query, output)
+        embedding = self.semantic_cache.embed(query)
+        label = self.semantic_cache.get(embedding)
+        if label is None:
+            output = self._get_generator().call(prompt_kwargs={"input": query})
+            label = self._process_output(query, output)
+            self._set_semantic_cache(embedding, label)
+        return label
+
+    async def acall(self, query: str) -> int:
+        if not self._use_semantic_cache():
+            output = await self._get_generator().acall(prompt_kwargs={"input": query})
+            return self._process_output(query, output)
+        embedding = await self.semantic_cache.aembed(query)
+        label = self.semantic_cache.get(embedding)
+        if label is None:
+            output = await self._get_generator().acall(prompt_kwargs={"input": query})
+            label = self._process_output(query, output)
+            self._set_semantic_cache(embedding, label)
+        return label
+
 
 if __name__ == "__main__":
 
@@ -1,5 +1,7 @@
 from typing import Any, Dict, Tuple, List
+import asyncio
 import tqdm
+import numpy as np
 from copy import deepcopy
 from torch.utils.data import DataLoader
 
@@ -20,6 +22,7 @@ from use_cases.classification.eval import ClassifierEvaluator
 from use_cases.classification.data import (
     SamplesToStr,
     load_datasets,
+    extract_class_labels,
     _COARSE_LABELS_DESC,
     _COARSE_LABELS,
 )
@@ -39,9 +42,12 @@ class TrecTrainer(Component):
         test_dataset=None,
         num_shots: int = 5,
         batch_size: int = 6,
+        max_concurrency: int = 16,
     ) -> None:
         super().__init__()
         self.num_classes = num_classes
+        # max number of in-flight model calls during evaluation
+        self.max_concurrency = max_concurrency
         self.task = TRECClassifier(
             labels=_COARSE_LABELS, labels_desc=_COARSE_LABELS_DESC
         )
@@ -118,35 +124,51 @@ class TrecTrainer(Component):
             model_kwargs=model_kwargs,
         )
 
+    async def _apredict(self, texts: List[str]) -> List[int]:
+        r"""Classify the texts concurrently, bounded by max_concurrency, in the same order."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def predict_one(text: str) -> int:
+            async with semaphore:
+                return await self.task.acall(text)
+
+        return await asyncio.gather(*[predict_one(text) for text in texts])
+
+    def predict(self, texts: List[str]) -> List[int]:
+        r"""The examples are fixed during one evaluation, render the system section only once."""
+        self.task.freeze_examples()
+        try:
+            return asyncio.run(self._apredict(list(texts)))
+        finally:
+            self.task.unfreeze_examples()
+
+    def _get_valid_responses(
+        self, predictions: List[Any], labels: List[int]
+    ) -> Tuple[List[int], List[int], int]:
+        r"""Drop the invalid predictions (-1) and their targets in one pass over the arrays."""
+        preds = extract_class_labels(predictions)
+        targets = np.asarray(labels, dtype=np.int64)
+        valid = preds != -1
+        for index in np.flatnonzero(~valid):
+            log.error(
+                f"invalid response: {predictions[index]}, target: {targets[index]}"
+            )
+        return preds[valid].tolist(), targets[valid].tolist(), int((~valid).sum())
+
     def eval(self, dataset=None) -> Tuple[float, float]:
         r"""
         TODO: automatically tracking the average inference time
         """
-        responses = []
-        targets = []
-        num_invalid = 0
         if dataset is None:
             dataset = self.eval_dataset
 
         # OR use dataloader
         print(f"dataset: {dataset}")
         # subset = dataset.select(range(0, 10))
-        for text, coarse_label in tqdm.tqdm(
-            zip(dataset["text"], dataset["coarse_label"])
-        ):
-            log.info(f"data: text: {text}, coarse_label: {coarse_label}")
-            # task_input = data["text"]
-            # corse_label = data["coarse_label"]
-            # print(f"task_input: {task_input}, corse_label: {corse_label}")
-            # print(f"types: {type(task_input)}, {type(corse_label)}")
-
-            response = self.task(text)
-            if response == -1:
-                log.error(f"invalid response: {response}")
-                num_invalid += 1
-                continue
-            responses.append(response)
-            targets.append(int(coarse_label))
+        predictions = self.predict(dataset["text"])
+        responses, targets, num_invalid = self._get_valid_responses(
+            predictions, dataset["coarse_label"]
+        )
 
         # evaluate the responses
         log.info(f"responses: {responses}, targets: {targets}")
@@ -162,23 +184,10 @@ class TrecTrainer(Component):
         r"""
         batch evaluation
         """
-        responses = []
-        targets = []
-        num_invalid = 0
-        for text, corse_label in zip(batch["text"], batch["coarse_label"]):
-            # print(f"data: {data}")
-            task_input = text
-            # corse_label = data["coarse_label"]
-            print(f"task_input: {task_input}, corse_label: {corse_label}")
-            print(f"types: {type(task_input)}, {type(corse_label)}")
-
-            response = self.task(task_input)
-            if response == -1:
-                print(f"invalid response: {response}")
-                num_invalid += 1
-                continue
-            responses.append(response)
-            targets.append(int(corse_label))
+        predictions = self.predict(batch["text"])
+        responses, targets, num_invalid = self._get_valid_responses(
+            predictions, batch["coarse_label"]
+        )
 
         # evaluate the responses
         print(f"responses: {responses}, targets: {targets}")
@@ -529,6 +538,14 @@ if __name__ == "__main__":
     from use_cases.classification.config_log import log
     from lightrag.utils import save_json
 
+    try:
+        import uvloop
+
+        # libuv-based event loop, less overhead per task on the concurrent eval calls
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     train_dataset, eval_dataset, test_dataset = load_datasets()
     # TODO: ensure each time the selected eval and test dataset and train dataset are the same
     num_shots = 6
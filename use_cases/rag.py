@@ -15,12 +15,13 @@ from lightrag.components.data_process import (
     TextSplitter,
 )
 
-setup_env()
+setup_env(required_keys=["OPENAI_API_KEY"])
 # TODO: RAG can potentially be a component itsefl and be provided to the users
 
 configs = {
     "embedder": {
         "batch_size": 100,
+        "max_concurrency": 8,
         "model_kwargs": {
             "model": "text-embedding-3-small",
             "dimensions": 256,
@@ -34,6 +35,9 @@ configs = {
         "model": "gpt-3.5-turbo",
         "temperature": 0.3,
         "stream": False,
+        # route the requests sharing the static prompt prefix to the same OpenAI prompt cache,
+        # sent in the request body as the pinned openai sdk does not have the argument
+        "extra_body": {"prompt_cache_key": "simple_rag_v1"},
     },
     "text_splitter": {
         "split_by": "word",
@@ -51,7 +55,9 @@ def prepare_data_pipeline():
         model_kwargs=configs["embedder"]["model_kwargs"],
     )
     embedder_transformer = ToEmbeddings(
-        embedder=embedder, batch_size=configs["embedder"]["batch_size"]
+        embedder=embedder,
+        batch_size=configs["embedder"]["batch_size"],
+        max_concurrency=configs["embedder"]["max_concurrency"],
     )
     data_transformer = Sequential(splitter, embedder_transformer)
     return data_transformer
@@ -79,6 +85,22 @@ Output JSON format:
     "answer": "The answer to the query",
 }"""
 
+# the static task description comes first and alone in <SYS></SYS> so the prompt prefix is identical
+# across queries for the provider prompt caching, the retrieved context and the query follow it
+RAG_TEMPLATE = r"""<SYS>
+{{task_desc_str}}
+</SYS>
+{% if context_str %}
+<CONTEXT>
+{{context_str}}
+</CONTEXT>
+{% endif %}
+<User>
+{{input_str}}
+</User>
+You:
+"""
+
 
 class RAG(Component):
 
@@ -90,8 +112,10 @@ class RAG(Component):
         self.transformed_docs: List[Document] = self.db.get_transformed_data(
             "data_transformer"
         )
+        # one client for the embedder and the generator, they share its sync and async clients
+        model_client = OpenAIClient()
         embedder = Embedder(
-            model_client=ModelClientType.OPENAI(),
+            model_client=model_client,
             model_kwargs=configs["embedder"]["model_kwargs"],
         )
         # map the documents to embeddings
@@ -103,16 +127,11 @@ class RAG(Component):
         )
         self.retriever_output_processors = RetrieverOutputToContextStr(deduplicate=True)
         self.generator = Generator(
-            model_client=ModelClientType.OPENAI(),
-            model_kwargs=configs["generator"],
-            output_processors=JsonParser(),
-        )
-
-        self.generator = Generator(
+            template=RAG_TEMPLATE,
             prompt_kwargs={
                 "task_desc_str": rag_prompt_task_desc,
             },
-            model_client=OpenAIClient(),
+            model_client=model_client,
             model_kwargs=configs["generator"],
             output_processors=JsonParser(),
         )
@@ -1,20 +1,40 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Union
+import asyncio
+import hashlib
+import json
+import logging
 import dotenv
+import numpy as np
 import yaml
 
+try:  # optional, faster parsing of the settings cache
+    import orjson
+
+    _json_loads, _json_dumps = orjson.loads, orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
 from lightrag.core.generator import Generator
 from lightrag.core.embedder import Embedder
 
-from lightrag.core.types import Document
+from lightrag.core.types import Document, RetrieverOutput
 
 from lightrag.core.string_parser import JsonParser
-from lightrag.core.component import Component, Sequential
+from lightrag.core.component import Component
+from lightrag.core.container import Sequential
 from lightrag.core.db import LocalDB
+from lightrag.core.model_client import ResponseCache
+from lightrag.core.semantic_cache import SemanticCache
+from lightrag.core.tokenizer import get_tokenizer
+from lightrag.utils import save_pickle, load_pickle
 
-from lightrag.components.data_process import (
-    RetrieverOutputToContextStr,
-    ToEmbeddings,
-    DocumentSplitter,
+from lightrag.components.data_process import ToEmbeddings, TextSplitter
+from lightrag.components.data_process.data_components import (
+    chunk_texts_to_context_str,
 )
 
 import os
@@ -26,46 +46,120 @@ os.environ["KMP_DUPLICATE_LIB_OK"] = "True"
 from lightrag.components.model_client import OpenAIClient
 from lightrag.components.retriever import FAISSRetriever
 
+from use_cases.rag import RAG_TEMPLATE, rag_prompt_task_desc
+
+# the corpus follows the task description in <SYS></SYS>, the static prompt prefix cached by the provider
+CAG_TEMPLATE = r"""<SYS>
+{{task_desc_str}}
+<CONTEXT>
+{{context_str}}
+</CONTEXT>
+</SYS>
+<User>
+{{input_str}}
+</User>
+You:
+"""
+
+
+# skip reading the .env file when the keys are already set, e.g. in a deployed environment
+if not os.environ.get("OPENAI_API_KEY"):
+    dotenv.load_dotenv(dotenv_path=".env", override=True)
 
-dotenv.load_dotenv(dotenv_path=".env", override=True)
+log = logging.getLogger(__name__)
+
+
+def load_settings(path: str) -> dict:
+    r"""Load the yaml settings, parsed once into a json cache next to it.
+
+    The cache ``.<name>.cache.json`` records the yaml modification time and is reused until the yaml changes.
+    """
+    yaml_mtime_ns = os.stat(path).st_mtime_ns
+    cache_path = os.path.join(
+        os.path.dirname(path), f".{os.path.basename(path)}.cache.json"
+    )
+    if os.path.exists(cache_path):
+        with open(cache_path, "rb") as file:
+            cache = _json_loads(file.read())
+        if cache.get("mtime_ns") == yaml_mtime_ns:
+            return cache["settings"]
+
+    with open(path, "r") as file:
+        settings = yaml.safe_load(file)
+    try:
+        with open(cache_path, "wb") as file:
+            file.write(_json_dumps({"mtime_ns": yaml_mtime_ns, "settings": settings}))
+    except OSError as e:  # e.g. a read-only file system, the settings are still loaded
+        print(f"Failed to write the settings cache {cache_path}: {e}")
+    return settings
 
 
 # TODO: RAG can potentially be a component itsefl and be provided to the users
 class RAG(Component):
+    r"""RAG pipeline configured by the settings loaded from ``configs/rag.yaml``.
 
-    def __init__(self, settings: dict):
+    Pass ``cache_dir`` to save the chunks and the index, ``build_index`` reuses them when
+    neither the documents nor the settings changed, skipping the embedding and the index training.
+
+    With ``cache.enabled`` in the settings, ``call`` returns the previous answer of the same query,
+    or of a paraphrased query by the cosine similarity of the query embeddings, until its ttl expires
+    or ``build_index`` is called again.
+    In "cag" mode the queries are not embedded and only the same query is matched.
+
+    ``mode`` in the settings is one of "rag", "cag" and "auto". In "cag" (Cache-Augmented Generation) mode,
+    the whole corpus is put in the static system prompt for the provider prompt caching, and ``call`` skips
+    the retrieval. "auto" uses "cag" when that prompt has fewer than ``cag_threshold_tokens`` tokens.
+
+    The chunks are kept as parallel lists ``chunk_ids``, ``chunk_texts`` and ``chunk_meta_data`` indexed
+    by the retriever's doc index, the transformed documents with their vectors are dropped from the db
+    once the index is built.
+    """
+
+    def __init__(self, settings: dict, cache_dir: Optional[str] = None):
         super().__init__()
+        self.cache_dir = cache_dir
         self.vectorizer_settings = settings["vectorizer"]
         self.retriever_settings = settings["retriever"]
         self.generator_model_kwargs = settings["generator"]
         self.text_splitter_settings = settings["text_splitter"]
+        self.cache_settings = settings.get("cache", {})
+        self.mode = settings.get("mode", "rag")
+        if self.mode not in ("rag", "cag", "auto"):
+            raise ValueError(f"Invalid mode: {self.mode}")
+        self.cag_threshold_tokens = settings.get("cag_threshold_tokens", 12000)
+        self.use_cag = False  # decided in build_index
+        self.chunk_ids: List[str] = []
+        self.chunk_texts: List[str] = []
+        self.chunk_meta_data: List[Optional[Dict[str, Any]]] = []
 
+        # one client for the vectorizer and the generators, they share its sync and async clients
+        self.model_client = OpenAIClient()
         vectorizer = Embedder(
-            model_client=OpenAIClient(),
+            model_client=self.model_client,
             # batch_size=self.vectorizer_settings["batch_size"],
             model_kwargs=self.vectorizer_settings["model_kwargs"],
         )
         # TODO: check document splitter, how to process the parent and order of the chunks
-        text_splitter = DocumentSplitter(
+        text_splitter = TextSplitter(
             split_by=self.text_splitter_settings["split_by"],
-            split_length=self.text_splitter_settings["chunk_size"],
-            split_overlap=self.text_splitter_settings["chunk_overlap"],
+            chunk_size=self.text_splitter_settings["chunk_size"],
+            chunk_overlap=self.text_splitter_settings["chunk_overlap"],
         )
         self.data_transformer = Sequential(
             text_splitter,
             ToEmbeddings(
                 embedder=vectorizer,
                 batch_size=self.vectorizer_settings["batch_size"],
+                max_concurrency=self.vectorizer_settings.get("max_concurrency", 1),
             ),
         )
         self.data_transformer_key = self.data_transformer._get_name()
         # initialize retriever, which depends on the vectorizer too
         self.retriever = FAISSRetriever(
-            top_k=self.retriever_settings["top_k"],
+            **self.retriever_settings,
             dimensions=self.vectorizer_settings["model_kwargs"]["dimensions"],
-            vectorizer=vectorizer,
+            embedder=vectorizer,
         )
-        self.retriever_output_processors = RetrieverOutputToContextStr(deduplicate=True)
         # TODO: currently retriever will be applied on transformed data. but its not very obvious design pattern
         self.db = LocalDB(
             # retriever_transformer=data_transformer,  # prepare data for retriever to build index with
@@ -74,65 +168,271 @@ class RAG(Component):
         )
 
         # initialize generator
-        self.generator = Generator(
-            preset_prompt_kwargs={
-                "task_desc_str": r"""
-You are a helpful assistant.
-
-Your task is to answer the query that may or may not come with context information.
-When context is provided, you should stick to the context and less on your prior knowledge to answer the query.
-
-Output JSON format:
-{
-    "answer": "The answer to the query",
-}"""
-            },
-            model_client=OpenAIClient(),
+        self.generator = self._create_generator(RAG_TEMPLATE)
+        self.tracking = {"vectorizer": {"num_calls": 0, "num_tokens": 0}}
+
+        # exact match by query with a ttl, semantic match maps a paraphrased query to the exact key
+        self.response_cache: Optional[ResponseCache] = None
+        self.semantic_cache: Optional[SemanticCache] = None
+        if self.cache_settings.get("enabled", False):
+            self.response_cache = ResponseCache(
+                max_size=self.cache_settings.get("max_size", 1024),
+                ttl=self.cache_settings.get("ttl"),
+            )
+            self.semantic_cache = SemanticCache(
+                embedder=vectorizer,
+                threshold=self.cache_settings.get("threshold", 0.97),
+                max_size=self.cache_settings.get("max_size", 1024),
+            )
+
+    def _create_generator(self, template: str, **prompt_kwargs) -> Generator:
+        return Generator(
+            template=template,
+            prompt_kwargs={"task_desc_str": rag_prompt_task_desc, **prompt_kwargs},
+            model_client=self.model_client,
             model_kwargs=self.generator_model_kwargs,
             output_processors=JsonParser(),
         )
-        self.tracking = {"vectorizer": {"num_calls": 0, "num_tokens": 0}}
+
+    def _get_index_cache_key(self, documents: List[Document]) -> str:
+        r"""Hash the documents and the settings that the chunks and the index depend on."""
+        hasher = hashlib.sha256()
+        for doc in sorted(documents, key=lambda doc: doc.id):
+            hasher.update(f"{doc.id}\0{doc.text}\0".encode("utf-8"))
+        settings = {
+            "text_splitter": self.text_splitter_settings,
+            "vectorizer": self.vectorizer_settings,
+            "retriever": self.retriever_settings,
+        }
+        hasher.update(json.dumps(settings, sort_keys=True).encode("utf-8"))
+        return hasher.hexdigest()
 
     def build_index(self, documents: List[Document]):
-        self.db.load_documents(documents)
-        self.map_key = self.db.map_data()
-        print(f"map_key: {self.map_key}")
-        self.data_key = self.db.transform_data(self.data_transformer)
+        # the cached answers are of the previous corpus
+        if self.response_cache is not None:
+            self.response_cache.clear()
+            self.semantic_cache.clear()
+        if self.mode != "rag":
+            # the corpus is the static context of every call, no chunks or index are needed
+            corpus_str = "\n\n".join(doc.text for doc in documents)
+            cag_generator = self._create_generator(CAG_TEMPLATE, context_str=corpus_str)
+            # the <SYS></SYS> prefix with the corpus is counted once per corpus
+            num_tokens = get_tokenizer().count_prompt_tokens(
+                cag_generator.prompt(input_str="")
+            )
+            self.use_cag = self.mode == "cag" or num_tokens < self.cag_threshold_tokens
+            if self.use_cag:
+                self.generator = cag_generator
+                log.info(f"use cag with the prompt of {num_tokens} tokens")
+                return
+            # a previous build may have put its corpus in the generator
+            self.generator = self._create_generator(RAG_TEMPLATE)
+
+        if self.cache_dir:
+            key = self._get_index_cache_key(documents)
+            index_path = os.path.join(self.cache_dir, f"{key}.faiss")
+            chunks_path = os.path.join(self.cache_dir, f"{key}.chunk_store.pkl")
+            if os.path.exists(index_path) and os.path.exists(chunks_path):
+                self._set_chunks(**load_pickle(chunks_path))
+                self.retriever.load_index(index_path)
+                print(f"index loaded from {index_path}")
+                return
+
+        self.db.load(documents)
+        self.data_key = self.db.transform(
+            self.data_transformer, key=self.data_transformer_key
+        )
         print(f"data_key: {self.data_key}")
-        self.transformed_documents = self.db.get_transformed_data(self.data_key)
-        self.retriever.build_index_from_documents(self.transformed_documents)
+        transformed_documents = self.db.get_transformed_data(self.data_key)
+        self.retriever.build_index_from_documents(
+            transformed_documents, document_map_func=lambda doc: doc.vector
+        )
+        self._set_chunks(
+            ids=[doc.id for doc in transformed_documents],
+            texts=[doc.text for doc in transformed_documents],
+            meta_data=[doc.meta_data for doc in transformed_documents],
+        )
+        if self.cache_dir:
+            # the vectors are saved in the index, not again with the chunks
+            save_pickle(
+                {
+                    "ids": self.chunk_ids,
+                    "texts": self.chunk_texts,
+                    "meta_data": self.chunk_meta_data,
+                },
+                chunks_path,
+            )
+            self.retriever.save_to_file(index_path)
+            if self.retriever.mmap:
+                # page in the saved index on demand, the retriever drops its vectors
+                self.retriever.load_index(index_path)
+        # the chunk lists and the index are all that is used, drop the transformed
+        # documents with their vectors
+        del self.db.transformed_items[self.data_key]
+
+    def _set_chunks(
+        self,
+        ids: List[str],
+        texts: List[str],
+        meta_data: List[Optional[Dict[str, Any]]],
+    ):
+        self.chunk_ids = ids
+        self.chunk_texts = texts
+        self.chunk_meta_data = meta_data
 
     def generate(self, query: str, context: Optional[str] = None) -> Any:
         if not self.generator:
             raise ValueError("Generator is not set")
 
-        prompt_kwargs = {
-            "context_str": context,
-            "input_str": query,
-        }
+        prompt_kwargs = {"input_str": query}
+        # in cag mode the corpus is already the context of the generator
+        if context is not None:
+            prompt_kwargs["context_str"] = context
         response = self.generator(prompt_kwargs=prompt_kwargs)
         if response.error:
             raise ValueError(f"Error in generator: {response.error}")
         return response.data
 
     def call(self, query: str) -> Any:
-        retrieved_documents = self.retriever(query)
-        # fill in the document
-        for i, retriever_output in enumerate(retrieved_documents):
-            retrieved_documents[i].documents = [
-                self.transformed_documents[doc_index]
-                for doc_index in retriever_output.doc_indexes
-            ]
-        # convert all the documents to context string
+        if self.response_cache is None:
+            return self._retrieve_and_generate(query)
+
+        key = ResponseCache.hash_key({"query": query})
+        output = self.response_cache.get(key)
+        if output is not None:
+            return output
+        if self.use_cag:
+            # nothing is retrieved, only the exact cache is used
+            output = self._retrieve_and_generate(query)
+            self.response_cache.set(key, output)
+            return output
+        # the embedding is reused by the retriever on a miss
+        embedding = self.semantic_cache.embed(query)
+        similar_key = self.semantic_cache.get(embedding)
+        if similar_key is not None:
+            output = self.response_cache.get(similar_key)
+            if output is not None:
+                return output
 
-        context_str = self.retriever_output_processors(retrieved_documents)
+        output = self._retrieve_and_generate(query, embedding)
+        self.response_cache.set(key, output)
+        self.semantic_cache.set(embedding, key)
+        return output
 
+    def _retrieve_and_generate(
+        self, query: str, embedding: Optional[np.ndarray] = None
+    ) -> Any:
+        if self.use_cag:
+            return self.generate(query), None
+        if embedding is not None:
+            retrieved_documents = self.retriever(embedding.reshape(1, -1))
+        else:
+            retrieved_documents = self.retriever(query)
+        context_str = self._to_context_str(retrieved_documents)
         return self.generate(query, context=context_str), context_str
 
+    def _to_context_str(
+        self, retrieved_documents: Union[RetrieverOutput, List[RetrieverOutput]]
+    ) -> str:
+        outputs = (
+            [retrieved_documents]
+            if isinstance(retrieved_documents, RetrieverOutput)
+            else retrieved_documents
+        )
+        doc_indices = [
+            doc_index for output in outputs for doc_index in output.doc_indices
+        ]
+        return chunk_texts_to_context_str(
+            [self.chunk_ids[doc_index] for doc_index in doc_indices],
+            [self.chunk_texts[doc_index] for doc_index in doc_indices],
+            deduplicate=True,
+        )
+
+    async def agenerate(self, query: str, context: Optional[str] = None) -> Any:
+        prompt_kwargs = {"input_str": query}
+        if context is not None:
+            prompt_kwargs["context_str"] = context
+        response = await self.generator.acall(prompt_kwargs=prompt_kwargs)
+        if response.error:
+            raise ValueError(f"Error in generator: {response.error}")
+        return response.data
+
+    async def acall(self, query: str) -> Any:
+        return (await self.abatch([query]))[0]
+
+    async def abatch(self, queries: List[str], max_concurrency: int = 8) -> List[Any]:
+        r"""Answer the queries with the generator calls running concurrently.
+
+        The queries missing in the exact cache are embedded in one batch, the embeddings are used
+        for both the semantic cache lookup and the retrieval of the remaining queries, searched at once.
+        Then at most ``max_concurrency`` generator calls are in flight.
+        """
+        outputs: List[Any] = [None] * len(queries)
+        keys = [ResponseCache.hash_key({"query": query}) for query in queries]
+        if self.response_cache is not None:
+            outputs = [self.response_cache.get(key) for key in keys]
+        missing = [i for i, output in enumerate(outputs) if output is None]
+        if not missing:
+            return outputs
+
+        # nothing is retrieved in cag mode, only the exact cache is used
+        embeddings: List[Optional[np.ndarray]] = [None] * len(missing)
+        if self.semantic_cache is not None and not self.use_cag:
+            embeddings = await self.semantic_cache.aembed_batch(
+                [queries[i] for i in missing]
+            )
+            for i, embedding in zip(missing, embeddings):
+                similar_key = self.semantic_cache.get(embedding)
+                if similar_key is not None:
+                    outputs[i] = self.response_cache.get(similar_key)
+            embeddings = [
+                embedding
+                for i, embedding in zip(missing, embeddings)
+                if outputs[i] is None
+            ]
+            missing = [i for i in missing if outputs[i] is None]
+            if not missing:
+                return outputs
+
+        if self.use_cag:
+            retrieved_documents = [None] * len(missing)
+        elif all(embedding is not None for embedding in embeddings):
+            retrieved_documents = self.retriever(np.stack(embeddings))
+        else:
+            retrieved_documents = self.retriever([queries[i] for i in missing])
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def answer(
+            i: int,
+            retriever_output: Optional[RetrieverOutput],
+            embedding: Optional[np.ndarray],
+        ):
+            context_str = (
+                self._to_context_str(retriever_output)
+                if retriever_output is not None
+                else None
+            )
+            async with semaphore:
+                response = await self.agenerate(queries[i], context=context_str)
+            outputs[i] = (response, context_str)
+            if self.response_cache is not None:
+                self.response_cache.set(keys[i], outputs[i])
+            if self.semantic_cache is not None:
+                self.semantic_cache.set(embedding, keys[i])
+
+        await asyncio.gather(
+            *[
+                answer(i, output, embedding)
+                for i, output, embedding in zip(
+                    missing, retrieved_documents, embeddings
+                )
+            ]
+        )
+        return outputs
+
 
 if __name__ == "__main__":
-    with open("./configs/rag.yaml", "r") as file:
-        settings = yaml.safe_load(file)
+    settings = load_settings("./configs/rag.yaml")
     print(settings)
     # NOTE: for the ouput of this following code, check text_lightrag.txt
     doc1 = Document(
@@ -147,7 +447,7 @@ if __name__ == "__main__":
         + "lots of more nonsense text" * 250,
         id="doc2",
     )
-    rag = RAG(settings)
+    rag = RAG(settings, cache_dir="./index_cache")
     print(rag)
     rag.build_index([doc1, doc2])
     print(rag.tracking)
@@ -158,4 +458,9 @@ if __name__ == "__main__":
     print(f"execution graph: {rag._execution_graph}")
     print(f"response: {response}")
     print(f"subcomponents: {rag._components}")
+
+    # the generator calls of the queries run concurrently
+    queries = [query, "What does Li Yin love?", "What is Li Yin's job?"]
+    responses = asyncio.run(rag.abatch(queries))
+    print(f"batch responses: {[response for response, _ in responses]}")
     rag.visualize_graph_html("my_component_graph.html")
@@ -1,8 +1,10 @@
+from typing import Optional
 import asyncio
 import time
 
 from lightrag.core.generator import Generator
 from lightrag.core.component import Component
+from lightrag.core.semantic_cache import SemanticCache
 from lightrag.components.model_client import OpenAIClient
 from lightrag.components.model_client import GroqAPIClient
 from lightrag.components.model_client import AnthropicAPIClient
@@ -11,10 +13,15 @@ from lightrag.components.model_client import AnthropicAPIClient
 class SimpleQA(Component):
     r"""
     User-defined component who wants to switch between providers like OpenAI and Groq.
+
+    Pass a ``SemanticCache`` to answer paraphrased queries from the cache.
     """
 
     def __init__(
-        self, provider: str = "openai", model_kwargs: dict = {"model": "gpt-3.5-turbo"}
+        self,
+        provider: str = "openai",
+        model_kwargs: dict = {"model": "gpt-3.5-turbo"},
+        semantic_cache: Optional[SemanticCache] = None,
     ):
         super().__init__()
         if provider == "openai":
@@ -30,15 +37,40 @@ class SimpleQA(Component):
             raise ValueError(f"Unknown provider: {provider}")
         self.generator = Generator(model_client=model_client, model_kwargs=model_kwargs)
         self.generator.print_prompt()
+        self.semantic_cache = semantic_cache
 
     def call(self, query: str) -> str:
-        return self.generator({"input_str": query})
+        if self.semantic_cache is None:
+            return self.generator({"input_str": query})
+        embedding = self.semantic_cache.embed(query)
+        output = self.semantic_cache.get(embedding)
+        if output is None:
+            output = self.generator({"input_str": query})
+            if output.error is None:
+                self.semantic_cache.set(embedding, output)
+        return output
 
     async def acall(self, query: str) -> str:
-        return await self.generator.acall({"input_str": query})
+        if self.semantic_cache is None:
+            return await self.generator.acall({"input_str": query})
+        embedding = await self.semantic_cache.aembed(query)
+        output = self.semantic_cache.get(embedding)
+        if output is None:
+            output = await self.generator.acall({"input_str": query})
+            if output.error is None:
+                self.semantic_cache.set(embedding, output)
+        return output
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+
+        # libuv-based event loop, less overhead per task on many concurrent calls
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     query = "What is the capital of France?"
     queries = [query] * 10
 